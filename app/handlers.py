@@ -1,12 +1,25 @@
+import hmac
 import os
-from typing import Optional
+import time
+from typing import Optional, Union
 
-from fastapi import HTTPException
+from fastapi import HTTPException, Request
 
 from app.logging_utils import TranslateLogSpan, stable_text_hash
 from app.metrics import translator_errors_total
-from app.schemas import TranslationRequest
-from app.translator import translator_service
+from app.schemas import (
+    MultiTranslationRequest,
+    MultiTranslationResponse,
+    TargetTranslation,
+    TranslationRequest,
+    TranslationResponse,
+)
+from app.sessions import translate_incremental
+from app.translator import (
+    ModelUnavailableError,
+    UnsupportedLanguagePairError,
+    translator_service,
+)
 
 
 def handle_translate_error(
@@ -15,24 +28,36 @@ def handle_translate_error(
     error_category: str,
     detail: str,
     exc: Exception,
+    endpoint: str = "/translate",
 ) -> None:
     translator_errors_total.labels(
-        endpoint="/translate", error_category=error_category
+        endpoint=endpoint, error_category=error_category
     ).inc()
     level = "exception" if status_code == 500 and error_category == "internal_error" else "info"
     span.failure(status_code=status_code, error_category=error_category, level=level)
     raise HTTPException(status_code=status_code, detail=detail) from exc
 
 
+def require_admin_token(request: Request) -> None:
+    expected = os.getenv("ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=403, detail="Admin API is disabled.")
+    provided = request.headers.get("X-Admin-Token", "")
+    if not hmac.compare_digest(provided.encode(), expected.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token.")
+
+
 def build_base_fields(
-    payload: TranslationRequest,
+    payload: Union[TranslationRequest, MultiTranslationRequest],
     request_id: Optional[str],
     source_lang: str,
     target_lang: str,
+    text_hash: Optional[str] = None,
 ) -> dict:
     text_length = len(payload.text)
     app_version = os.getenv("APP_VERSION", "unknown")
-    text_hash = stable_text_hash(payload.text)
+    if text_hash is None:
+        text_hash = stable_text_hash(payload.text)
     model_id = (
         translator_service.model_id_for_pair(source_lang, target_lang) or "unknown"
     )
@@ -45,3 +70,128 @@ def build_base_fields(
         "app_version": app_version,
         "text_hash": text_hash,
     }
+
+
+def translate_payload(
+    payload: TranslationRequest,
+    request_id: Optional[str],
+    endpoint: str = "/translate",
+) -> TranslationResponse:
+    source_lang = translator_service.normalize_lang(payload.source_lang)
+    target_lang = translator_service.normalize_lang(payload.target_lang)
+    base_fields = build_base_fields(payload, request_id, source_lang, target_lang)
+    return _translate_pair(
+        payload.text, source_lang, target_lang, base_fields, payload.session_id, endpoint
+    )
+
+
+def translate_multi_payload(
+    payload: MultiTranslationRequest,
+    request_id: Optional[str],
+    endpoint: str = "/translate/multi",
+) -> MultiTranslationResponse:
+    start = time.perf_counter()
+    source_lang = translator_service.normalize_lang(payload.source_lang)
+    target_langs = dict.fromkeys(
+        translator_service.normalize_lang(lang) for lang in payload.target_langs
+    )
+    text_hash = stable_text_hash(payload.text)
+    lanes = [
+        translator_service.submit_to_lane(
+            _translate_target, payload, request_id, source_lang, target_lang, text_hash, endpoint
+        )
+        for target_lang in target_langs
+    ]
+    return MultiTranslationResponse(
+        source_lang=source_lang,
+        translations=[lane.result() for lane in lanes],
+        latency_ms=int((time.perf_counter() - start) * 1000),
+    )
+
+
+def _translate_target(
+    payload: MultiTranslationRequest,
+    request_id: Optional[str],
+    source_lang: str,
+    target_lang: str,
+    text_hash: str,
+    endpoint: str,
+) -> TargetTranslation:
+    start = time.perf_counter()
+    base_fields = build_base_fields(payload, request_id, source_lang, target_lang, text_hash)
+    try:
+        response = _translate_pair(
+            payload.text, source_lang, target_lang, base_fields, None, endpoint
+        )
+    except HTTPException as exc:
+        return TargetTranslation(
+            target_lang=target_lang,
+            status_code=exc.status_code,
+            latency_ms=int((time.perf_counter() - start) * 1000),
+            error=str(exc.detail),
+        )
+    return TargetTranslation(
+        target_lang=target_lang,
+        status_code=200,
+        latency_ms=int((time.perf_counter() - start) * 1000),
+        translation=response.translation,
+        model=response.model,
+    )
+
+
+def _translate_pair(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    base_fields: dict,
+    session_id: Optional[str],
+    endpoint: str,
+) -> TranslationResponse:
+    with translator_service.reserve(source_lang, target_lang) as loaded:
+        if loaded is not None:
+            # Log the model that serves this request, which may be a canary.
+            base_fields = {**base_fields, "model_id": loaded.model_id}
+        with TranslateLogSpan(base_fields) as span:
+            if source_lang == target_lang:
+                handle_translate_error(
+                    span,
+                    400,
+                    "bad_request",
+                    "source_lang and target_lang must be different",
+                    ValueError("source_lang == target_lang"),
+                    endpoint,
+                )
+
+            segments_total: Optional[int] = None
+            segments_reused: Optional[int] = None
+            try:
+                if session_id:
+                    translation, model_id, segments_total, segments_reused = (
+                        translate_incremental(text, source_lang, target_lang, session_id)
+                    )
+                else:
+                    translation, model_id = translator_service.translate(
+                        text,
+                        source_lang,
+                        target_lang,
+                    )
+            except UnsupportedLanguagePairError as exc:
+                handle_translate_error(span, 400, "bad_request", str(exc), exc, endpoint)
+            except ModelUnavailableError as exc:
+                handle_translate_error(span, 500, "internal_error", str(exc), exc, endpoint)
+            except Exception as exc:
+                handle_translate_error(
+                    span, 500, "internal_error", "Internal server error", exc, endpoint
+                )
+
+            latency_ms = span.success(status_code=200)
+
+    return TranslationResponse(
+        translation=translation,
+        model=model_id,
+        source_lang=source_lang,
+        target_lang=target_lang,
+        latency_ms=latency_ms,
+        segments_total=segments_total,
+        segments_reused=segments_reused,
+    )
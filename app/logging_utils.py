@@ -10,7 +10,7 @@ logger = logging.getLogger("app.translate")
 
 
 def log_translate(event: str, *, level: str = "info", **fields) -> None:
-    payload = {"event": event, **fields}
+    payload = {"event": event, "ts": round(time.time(), 3), **fields}
     message = json.dumps(payload)
 
     if level == "exception":
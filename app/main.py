@@ -1,28 +1,38 @@
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, Request, Response
-from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from fastapi import Depends, FastAPI, HTTPException, Request, Response, WebSocket
+from prometheus_client import CONTENT_TYPE_LATEST
 
-from app.handlers import build_base_fields, handle_translate_error
-from app.logging_utils import TranslateLogSpan
+from app.handlers import require_admin_token, translate_multi_payload, translate_payload
 from app.middleware import metrics_middleware, request_id_middleware
-from app.metrics import translator_model_available
-from app.schemas import TranslationRequest, TranslationResponse
+from app.metrics import metrics_exporter, translator_model_available
+from app.schemas import (
+    ModelPairRequest,
+    ModelRolloutRequest,
+    MultiTranslationRequest,
+    MultiTranslationResponse,
+    TranslationRequest,
+    TranslationResponse,
+)
 from app.translator import (
-    ModelUnavailableError,
+    RolloutConflictError,
     UnsupportedLanguagePairError,
     translator_service,
 )
+from app.ws import TranslateSocketSession
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    metrics_exporter.mark_dead_workers()
     # Model is loaded once per worker process (e.g., Uvicorn/Gunicorn workers).
     translator_service.load_all()
+    translator_model_available.set(1 if translator_service.is_available() else 0)
     yield
+    metrics_exporter.mark_worker_dead()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -50,7 +60,7 @@ def ready() -> dict:
 
 @app.get("/metrics")
 def metrics() -> Response:
-    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+    return Response(metrics_exporter.render(), media_type=CONTENT_TYPE_LATEST)
 
 
 @app.get("/supported-languages")
@@ -65,41 +75,59 @@ def supported_languages() -> dict:
 @app.post("/translate", response_model=TranslationResponse)
 def translate(payload: TranslationRequest, request: Request) -> TranslationResponse:
     request_id = getattr(request.state, "request_id", None)
-    source_lang = translator_service.normalize_lang(payload.source_lang)
-    target_lang = translator_service.normalize_lang(payload.target_lang)
-    base_fields = build_base_fields(payload, request_id, source_lang, target_lang)
-
-    with TranslateLogSpan(base_fields) as span:
-        if source_lang == target_lang:
-            handle_translate_error(
-                span,
-                400,
-                "bad_request",
-                "source_lang and target_lang must be different",
-                ValueError("source_lang == target_lang"),
-            )
-
-        try:
-            translation, model_id = translator_service.translate(
-                payload.text,
-                source_lang,
-                target_lang,
-            )
-        except UnsupportedLanguagePairError as exc:
-            handle_translate_error(span, 400, "bad_request", str(exc), exc)
-        except ModelUnavailableError as exc:
-            handle_translate_error(span, 500, "internal_error", str(exc), exc)
-        except Exception as exc:
-            handle_translate_error(
-                span, 500, "internal_error", "Internal server error", exc
-            )
-
-        latency_ms = span.success(status_code=200)
-
-    return TranslationResponse(
-        translation=translation,
-        model=model_id,
-        source_lang=source_lang,
-        target_lang=target_lang,
-        latency_ms=latency_ms,
-    )
+    return translate_payload(payload, request_id)
+
+
+@app.post("/translate/multi", response_model=MultiTranslationResponse)
+def translate_multi(
+    payload: MultiTranslationRequest, request: Request
+) -> MultiTranslationResponse:
+    request_id = getattr(request.state, "request_id", None)
+    return translate_multi_payload(payload, request_id)
+
+
+@app.websocket("/ws/translate")
+async def translate_ws(websocket: WebSocket) -> None:
+    await websocket.accept()
+    await TranslateSocketSession(websocket).run()
+
+
+@app.get("/admin/models", dependencies=[Depends(require_admin_token)])
+def admin_models() -> dict:
+    return {"models": translator_service.model_status()}
+
+
+@app.post("/admin/models", status_code=202, dependencies=[Depends(require_admin_token)])
+def admin_rollout(payload: ModelRolloutRequest) -> dict:
+    try:
+        return translator_service.start_rollout(
+            payload.source_lang,
+            payload.target_lang,
+            payload.model_id,
+            revision=payload.revision,
+            canary_percent=payload.canary_percent,
+        )
+    except UnsupportedLanguagePairError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except RolloutConflictError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+
+
+@app.post("/admin/models/promote", dependencies=[Depends(require_admin_token)])
+def admin_promote(payload: ModelPairRequest) -> dict:
+    try:
+        return translator_service.promote_canary(payload.source_lang, payload.target_lang)
+    except UnsupportedLanguagePairError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except RolloutConflictError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+
+
+@app.post("/admin/models/rollback", dependencies=[Depends(require_admin_token)])
+def admin_rollback(payload: ModelPairRequest) -> dict:
+    try:
+        return translator_service.rollback_canary(payload.source_lang, payload.target_lang)
+    except UnsupportedLanguagePairError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except RolloutConflictError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
@@ -1,4 +1,20 @@
-from prometheus_client import Counter, Gauge, Histogram
+import glob
+import os
+from typing import Optional
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Set (before prometheus_client is imported) when running several workers, so
+# every worker writes to shared files and any of them can serve the totals.
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
 
 
 translator_requests_total = Counter(
@@ -19,7 +35,59 @@ translator_request_latency_seconds = Histogram(
     ["endpoint"],
 )
 
+# Across live workers the minimum is reported: 0 if any worker lacks its model.
 translator_model_available = Gauge(
     "translator_model_available",
     "Whether the translation model is available",
+    multiprocess_mode="livemin",
 )
+
+
+class MetricsExporter:
+    """Renders the exposition output, merging worker files in multiprocess mode.
+
+    Merging reads one file per worker and metric type on every scrape, so its
+    cost grows linearly with the number of workers.
+    """
+
+    def __init__(self, multiproc_dir: Optional[str]):
+        self._multiproc_dir = multiproc_dir
+        if multiproc_dir:
+            self._registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(self._registry, path=multiproc_dir)
+        else:
+            self._registry = REGISTRY
+
+    def render(self) -> bytes:
+        return generate_latest(self._registry)
+
+    def mark_worker_dead(self) -> None:
+        if self._multiproc_dir:
+            multiprocess.mark_process_dead(os.getpid(), self._multiproc_dir)
+
+    def mark_dead_workers(self) -> None:
+        """Drops live-gauge files of workers that exited without shutting down.
+
+        A crashed worker never runs ``mark_worker_dead``, and its stale
+        ``livemin`` value would otherwise pin the aggregate. The replacement
+        worker calls this at startup.
+        """
+        if not self._multiproc_dir:
+            return
+        for path in glob.glob(os.path.join(self._multiproc_dir, "gauge_live*_*.db")):
+            pid = int(os.path.basename(path)[: -len(".db")].rsplit("_", 1)[1])
+            if pid != os.getpid() and not _pid_alive(pid):
+                multiprocess.mark_process_dead(pid, self._multiproc_dir)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+metrics_exporter = MetricsExporter(PROMETHEUS_MULTIPROC_DIR)
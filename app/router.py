@@ -0,0 +1,382 @@
+import asyncio
+import hashlib
+import itertools
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Set, Tuple
+
+import httpx
+from fastapi import FastAPI, HTTPException, Request, Response
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from app.metrics import metrics_exporter, translator_errors_total
+from app.middleware import metrics_middleware, request_id_middleware
+from app.schemas import MultiTranslationRequest, TranslationRequest
+
+# Comma-separated backend base URLs. A node may pin its pairs statically with
+# "url=en-fr;en-es"; otherwise its pairs come from its /supported-languages.
+ROUTER_NODES = os.getenv("ROUTER_NODES", "")
+ROUTER_REFRESH_SECONDS = float(os.getenv("ROUTER_REFRESH_SECONDS", "10"))
+ROUTER_TIMEOUT_SECONDS = float(os.getenv("ROUTER_TIMEOUT_SECONDS", "60"))
+ROUTER_MAX_CONNECTIONS = int(os.getenv("ROUTER_MAX_CONNECTIONS", "100"))
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
+
+Pair = Tuple[str, str]
+
+
+class NoBackendError(RuntimeError):
+    pass
+
+
+class Backend:
+    def __init__(self, url: str, pairs: Optional[Set[Pair]] = None):
+        self.url = url.rstrip("/")
+        self.static = pairs is not None
+        self.pairs: Set[Pair] = set(pairs or ())
+        # False until a discovered node first reports its pairs.
+        self.pairs_known = self.static
+        self.healthy = False
+        self.in_flight = 0
+
+
+def parse_nodes(spec: str) -> List[Backend]:
+    backends = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        url, _, pairs_spec = entry.partition("=")
+        pairs = None
+        if pairs_spec:
+            pairs = set()
+            for pair in pairs_spec.split(";"):
+                src, _, tgt = pair.strip().partition("-")
+                pairs.add((src.lower(), tgt.lower()))
+        backends.append(Backend(url, pairs))
+    return backends
+
+
+class ShardRouter:
+    """Routes translate calls to the backend nodes that host each pair.
+
+    Among healthy replicas of a pair, the one with the fewest in-flight
+    requests is chosen. Health and (for non-static nodes) hosted pairs are
+    refreshed from each node's /ready and /supported-languages.
+    """
+
+    def __init__(self, backends: List[Backend], client: httpx.AsyncClient):
+        self._backends = backends
+        self._client = client
+        self._rotation = itertools.count()
+
+    def backends(self) -> List[Backend]:
+        return list(self._backends)
+
+    def supported_pairs(self) -> Tuple[Pair, ...]:
+        pairs: Set[Pair] = set()
+        for backend in self._backends:
+            if backend.healthy:
+                pairs.update(backend.pairs)
+        return tuple(sorted(pairs))
+
+    def is_available(self) -> bool:
+        return any(backend.healthy for backend in self._backends)
+
+    def hosted_pairs(self) -> Tuple[Pair, ...]:
+        pairs: Set[Pair] = set()
+        for backend in self._backends:
+            pairs.update(backend.pairs)
+        return tuple(sorted(pairs))
+
+    def hosts(self, pair: Pair) -> bool:
+        return pair in self.hosted_pairs()
+
+    def pairs_pending(self) -> bool:
+        return not all(backend.pairs_known for backend in self._backends)
+
+    def pick(
+        self,
+        pair: Pair,
+        exclude: Optional[Set[str]] = None,
+        affinity: Optional[str] = None,
+    ) -> Backend:
+        candidates = self._candidates(pair, exclude)
+        if affinity is not None:
+            # Rendezvous hashing keeps a session on the node holding its
+            # cached segments while that node stays healthy.
+            return max(candidates, key=lambda backend: _affinity_score(affinity, backend.url))
+        return min(candidates, key=lambda backend: backend.in_flight)
+
+    def group_targets(
+        self, source_lang: str, target_langs: List[str], exclude: Optional[Set[str]] = None
+    ) -> Tuple[List[Tuple[Backend, List[str]]], Dict[str, str]]:
+        """Assigns targets to backends so each backend gets one call.
+
+        A target goes to a backend already chosen for this request when one
+        hosts it, otherwise to the candidate hosting the most of the targets.
+        Targets with no healthy backend are returned with their error.
+        """
+        wanted = {(source_lang, target_lang) for target_lang in target_langs}
+        groups: Dict[str, Tuple[Backend, List[str]]] = {}
+        unrouted: Dict[str, str] = {}
+        for target_lang in target_langs:
+            try:
+                candidates = self._candidates((source_lang, target_lang), exclude)
+            except NoBackendError as exc:
+                unrouted[target_lang] = str(exc)
+                continue
+            chosen = [backend for backend in candidates if backend.url in groups]
+            if chosen:
+                backend = min(chosen, key=lambda backend: backend.in_flight)
+            else:
+                backend = max(
+                    candidates,
+                    key=lambda backend: (len(wanted & backend.pairs), -backend.in_flight),
+                )
+            groups.setdefault(backend.url, (backend, []))[1].append(target_lang)
+        return list(groups.values()), unrouted
+
+    def _candidates(self, pair: Pair, exclude: Optional[Set[str]] = None) -> List[Backend]:
+        excluded = exclude or set()
+        candidates = [
+            backend
+            for backend in self._backends
+            if backend.healthy and pair in backend.pairs and backend.url not in excluded
+        ]
+        if not candidates:
+            raise NoBackendError(f"No healthy backend for {pair[0]}->{pair[1]}")
+        # Rotate the starting point so ties do not always land on one node.
+        offset = next(self._rotation) % len(candidates)
+        return candidates[offset:] + candidates[:offset]
+
+    async def refresh(self) -> None:
+        await asyncio.gather(*(self._refresh_backend(b) for b in self._backends))
+
+    async def _refresh_backend(self, backend: Backend) -> None:
+        try:
+            ready = await self._client.get(f"{backend.url}/ready")
+            backend.healthy = ready.status_code == 200
+            if not backend.static:
+                response = await self._client.get(f"{backend.url}/supported-languages")
+                response.raise_for_status()
+                backend.pairs = {
+                    (pair["source_lang"], pair["target_lang"])
+                    for pair in response.json().get("pairs", [])
+                }
+                backend.pairs_known = True
+        except (httpx.HTTPError, ValueError) as exc:
+            logger.warning("Backend %s unavailable: %s", backend.url, exc)
+            backend.healthy = False
+
+    async def refresh_forever(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.refresh()
+
+    async def forward(
+        self,
+        pair: Pair,
+        path: str,
+        payload: dict,
+        headers: Dict[str, str],
+        affinity: Optional[str] = None,
+    ) -> httpx.Response:
+        tried: Set[str] = set()
+        while True:
+            backend = self.pick(pair, exclude=tried, affinity=affinity)
+            try:
+                return await self.send(backend, path, payload, headers)
+            except httpx.ConnectError:
+                # Nothing reached the node, so another replica can take it.
+                tried.add(backend.url)
+
+    async def send(
+        self, backend: Backend, path: str, payload: dict, headers: Dict[str, str]
+    ) -> httpx.Response:
+        backend.in_flight += 1
+        try:
+            return await self._client.post(f"{backend.url}{path}", json=payload, headers=headers)
+        except httpx.ConnectError as exc:
+            logger.warning("Backend %s refused connection: %s", backend.url, exc)
+            backend.healthy = False
+            raise
+        finally:
+            backend.in_flight -= 1
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+def _pair_error(shard_router: ShardRouter, pair: Pair) -> Optional[str]:
+    if pair[0] == pair[1]:
+        return "source_lang and target_lang must be different"
+    # While a node has not reported its pairs yet, an unknown pair may be one
+    # of them, so it is left to fail as unavailable (503) rather than as 400.
+    if not shard_router.hosts(pair) and not shard_router.pairs_pending():
+        supported = ", ".join(f"{src}->{tgt}" for src, tgt in shard_router.hosted_pairs())
+        return f"Supported language pairs: {supported}"
+    return None
+
+
+def _affinity_score(key: str, url: str) -> bytes:
+    return hashlib.sha256(f"{key}|{url}".encode("utf-8")).digest()
+
+
+def create_shard_router(spec: str) -> ShardRouter:
+    client = httpx.AsyncClient(
+        timeout=ROUTER_TIMEOUT_SECONDS,
+        limits=httpx.Limits(
+            max_connections=ROUTER_MAX_CONNECTIONS,
+            max_keepalive_connections=ROUTER_MAX_CONNECTIONS,
+        ),
+    )
+    return ShardRouter(parse_nodes(spec), client)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    metrics_exporter.mark_dead_workers()
+    shard_router = create_shard_router(ROUTER_NODES)
+    await shard_router.refresh()
+    refresher = asyncio.create_task(shard_router.refresh_forever(ROUTER_REFRESH_SECONDS))
+    app.state.shard_router = shard_router
+    yield
+    refresher.cancel()
+    await shard_router.aclose()
+    metrics_exporter.mark_worker_dead()
+
+
+app = FastAPI(lifespan=lifespan)
+app.middleware("http")(request_id_middleware)
+app.middleware("http")(metrics_middleware)
+
+
+@app.get("/health")
+def health() -> dict:
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+def ready(request: Request) -> dict:
+    if not request.app.state.shard_router.is_available():
+        raise HTTPException(status_code=500, detail="No backend node is ready.")
+    return {"status": "ok"}
+
+
+@app.get("/metrics")
+def metrics() -> Response:
+    return Response(metrics_exporter.render(), media_type=CONTENT_TYPE_LATEST)
+
+
+@app.get("/supported-languages")
+def supported_languages(request: Request) -> dict:
+    pairs = [
+        {"source_lang": src, "target_lang": tgt}
+        for src, tgt in request.app.state.shard_router.supported_pairs()
+    ]
+    return {"pairs": pairs}
+
+
+@app.post("/translate")
+async def translate(payload: TranslationRequest, request: Request) -> Response:
+    shard_router: ShardRouter = request.app.state.shard_router
+    pair = (
+        payload.source_lang.strip().lower(),
+        payload.target_lang.strip().lower(),
+    )
+    pair_error = _pair_error(shard_router, pair)
+    if pair_error is not None:
+        translator_errors_total.labels(endpoint="/translate", error_category="bad_request").inc()
+        raise HTTPException(status_code=400, detail=pair_error)
+
+    headers = {"X-Request-ID": request.state.request_id}
+    try:
+        upstream = await shard_router.forward(
+            pair,
+            "/translate",
+            payload.model_dump(exclude_none=True),
+            headers,
+            affinity=payload.session_id,
+        )
+    except NoBackendError as exc:
+        translator_errors_total.labels(endpoint="/translate", error_category="unavailable").inc()
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    except httpx.HTTPError as exc:
+        translator_errors_total.labels(endpoint="/translate", error_category="upstream_error").inc()
+        raise HTTPException(status_code=502, detail="Backend request failed") from exc
+
+    return Response(
+        content=upstream.content,
+        status_code=upstream.status_code,
+        media_type=upstream.headers.get("content-type", "application/json"),
+    )
+
+
+@app.post("/translate/multi")
+async def translate_multi(payload: MultiTranslationRequest, request: Request) -> dict:
+    shard_router: ShardRouter = request.app.state.shard_router
+    source_lang = payload.source_lang.strip().lower()
+    target_langs = list(dict.fromkeys(lang.strip().lower() for lang in payload.target_langs))
+    headers = {"X-Request-ID": request.state.request_id}
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    results: Dict[str, dict] = {}
+
+    def fail(target_lang: str, status_code: int, error_category: str, error: str) -> None:
+        translator_errors_total.labels(
+            endpoint="/translate/multi", error_category=error_category
+        ).inc()
+        results[target_lang] = {
+            "target_lang": target_lang,
+            "status_code": status_code,
+            "latency_ms": int((loop.time() - start) * 1000),
+            "error": error,
+        }
+
+    async def forward_group(backend: Backend, group: List[str], tried: Set[str]) -> None:
+        body = {**payload.model_dump(exclude_none=True), "target_langs": group}
+        try:
+            upstream = await shard_router.send(backend, "/translate/multi", body, headers)
+        except httpx.ConnectError:
+            # Nothing reached the node, so other replicas can take the group.
+            await dispatch(group, tried | {backend.url})
+            return
+        except httpx.HTTPError:
+            for target_lang in group:
+                fail(target_lang, 502, "upstream_error", "Backend request failed")
+            return
+        if upstream.status_code != 200:
+            for target_lang in group:
+                fail(target_lang, upstream.status_code, "upstream_error", upstream.text)
+            return
+        for result in upstream.json()["translations"]:
+            results[result["target_lang"]] = result
+        for target_lang in group:
+            if target_lang not in results:
+                fail(target_lang, 502, "upstream_error", "Backend omitted this target")
+
+    async def dispatch(group: List[str], tried: Set[str]) -> None:
+        # Targets sharing a shard go out as one call; the rest fan out in parallel.
+        groups, unrouted = shard_router.group_targets(source_lang, group, exclude=tried)
+        for target_lang, error in unrouted.items():
+            fail(target_lang, 503, "unavailable", error)
+        await asyncio.gather(
+            *(forward_group(backend, targets, tried) for backend, targets in groups)
+        )
+
+    routable = []
+    for target_lang in target_langs:
+        pair_error = _pair_error(shard_router, (source_lang, target_lang))
+        if pair_error is not None:
+            fail(target_lang, 400, "bad_request", pair_error)
+        else:
+            routable.append(target_lang)
+    await dispatch(routable, set())
+    return {
+        "source_lang": source_lang,
+        "translations": [results[target_lang] for target_lang in target_langs],
+        "latency_ms": int((loop.time() - start) * 1000),
+    }
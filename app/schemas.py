@@ -1,16 +1,20 @@
-from typing import Optional, Annotated
+from typing import List, Optional, Annotated
 
-from pydantic import BaseModel, StringConstraints
+from pydantic import BaseModel, Field, StringConstraints
+
+TranslationText = Annotated[
+    str,
+    StringConstraints(min_length=1, max_length=1000, strip_whitespace=True),
+]
+MAX_TARGET_LANGS = 8
 
 
 class TranslationRequest(BaseModel):
-    text: Annotated[
-        str,
-        StringConstraints(min_length=1, max_length=1000, strip_whitespace=True),
-    ]
+    text: TranslationText
     source_lang: str = "en"
     target_lang: str
     request_id: Optional[str] = None
+    session_id: Optional[str] = None
 
 
 class TranslationResponse(BaseModel):
@@ -19,3 +23,43 @@ class TranslationResponse(BaseModel):
     source_lang: str
     target_lang: str
     latency_ms: int
+    segments_total: Optional[int] = None
+    segments_reused: Optional[int] = None
+
+
+class MultiTranslationRequest(BaseModel):
+    text: TranslationText
+    source_lang: str = "en"
+    target_langs: Annotated[List[str], Field(min_length=1, max_length=MAX_TARGET_LANGS)]
+    request_id: Optional[str] = None
+
+
+class TargetTranslation(BaseModel):
+    target_lang: str
+    status_code: int
+    latency_ms: int
+    translation: Optional[str] = None
+    model: Optional[str] = None
+    error: Optional[str] = None
+
+
+class MultiTranslationResponse(BaseModel):
+    source_lang: str
+    translations: List[TargetTranslation]
+    latency_ms: int
+
+
+class TranslationMessage(TranslationRequest):
+    id: str
+    key: Optional[str] = None
+
+
+class ModelPairRequest(BaseModel):
+    source_lang: str
+    target_lang: str
+
+
+class ModelRolloutRequest(ModelPairRequest):
+    model_id: str
+    revision: Optional[str] = None
+    canary_percent: Annotated[float, Field(ge=0, le=100)] = 0.0
@@ -0,0 +1,105 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from app.translator import translator_service
+
+SESSION_MAX_COUNT = int(os.getenv("SESSION_MAX_COUNT", "10000"))
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", "1800"))
+
+# Splits after sentence punctuation or at line breaks. The separators are
+# captured so the translated segments can be stitched back with them.
+_SEGMENT_SPLIT = re.compile(r"((?<=[.!?])\s+|\s*\n\s*)")
+
+# (session id, source, target, model id, model revision)
+SessionKey = Tuple[str, str, str, str, str]
+
+
+def split_segments(text: str) -> List[str]:
+    """Returns segments at even indices and their separators at odd ones."""
+    return _SEGMENT_SPLIT.split(text)
+
+
+class SessionStore:
+    """Per-session segment translations, bounded in count and expired by TTL.
+
+    Only the segments of the latest version of each document are kept, and
+    the least recently used session is evicted once ``max_sessions`` is hit.
+    """
+
+    def __init__(self, max_sessions: int, ttl_seconds: float):
+        self._max_sessions = max_sessions
+        self._ttl_seconds = ttl_seconds
+        self._sessions: "OrderedDict[SessionKey, Tuple[float, Dict[str, str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: SessionKey) -> Dict[str, str]:
+        with self._lock:
+            self._expire(time.monotonic())
+            entry = self._sessions.get(key)
+            return entry[1] if entry is not None else {}
+
+    def put(self, key: SessionKey, segments: Dict[str, str]) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._sessions[key] = (now, segments)
+            self._sessions.move_to_end(key)
+            self._expire(now)
+            while len(self._sessions) > self._max_sessions:
+                self._sessions.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _expire(self, now: float) -> None:
+        # Entries are ordered by last write, so expired ones are at the front.
+        while self._sessions:
+            key, (updated, _) = next(iter(self._sessions.items()))
+            if now - updated < self._ttl_seconds:
+                break
+            del self._sessions[key]
+
+
+session_store = SessionStore(SESSION_MAX_COUNT, SESSION_TTL_SECONDS)
+
+
+def translate_incremental(
+    text: str, source_lang: str, target_lang: str, session_id: str
+) -> Tuple[str, str, int, int]:
+    """Translates only segments that changed since the session's last version.
+
+    Returns the stitched translation, the model id, the number of segments
+    and how many of them were reused from the previous version.
+    """
+    # Every segment runs on the reserved model, so the cache is keyed by the
+    # exact model and revision (stable or canary) that produced it.
+    with translator_service.reserve(source_lang, target_lang) as loaded:
+        if loaded is not None:
+            model_id, revision = loaded.model_id, loaded.revision
+        else:
+            model_id = translator_service.model_id_for_pair(source_lang, target_lang) or "unknown"
+            revision = None
+        key = (session_id, source_lang, target_lang, model_id, revision or "")
+        previous = session_store.get(key)
+        current: Dict[str, str] = {}
+        parts = split_segments(text)
+        total = reused = 0
+        for index, segment in enumerate(parts):
+            if index % 2 or not segment:
+                continue
+            total += 1
+            if segment in current:
+                reused += 1
+            elif segment in previous:
+                reused += 1
+                current[segment] = previous[segment]
+            else:
+                current[segment], model_id = translator_service.translate(
+                    segment, source_lang, target_lang
+                )
+            parts[index] = current[segment]
+    session_store.put(key, current)
+    return "".join(parts), model_id, total, reused
@@ -0,0 +1,148 @@
+import json
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import torch
+from torch import nn
+from torch.nn import functional as F
+
+
+class Shortlist:
+    """Lexical shortlist for restricting the output vocabulary while decoding.
+
+    ``table`` maps a source token id to the target token ids it is likely to
+    produce; ``frequent`` holds target ids that are always allowed. The
+    ``model_id`` and ``revision`` record which vocabulary the ids belong to.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        table: Dict[int, List[int]],
+        frequent: List[int],
+        revision: Optional[str] = None,
+    ):
+        self.model_id = model_id
+        self.revision = revision
+        self.table = table
+        self.frequent = frequent
+
+    @classmethod
+    def load(cls, path: str) -> "Shortlist":
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        table = {int(src): list(tgts) for src, tgts in data["table"].items()}
+        return cls(data["model_id"], table, list(data["frequent"]), data.get("revision"))
+
+    def save(self, path: str) -> None:
+        data = {
+            "model_id": self.model_id,
+            "revision": self.revision,
+            "frequent": self.frequent,
+            "table": {str(src): tgts for src, tgts in sorted(self.table.items())},
+        }
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle)
+
+    def candidates(self, input_ids: torch.Tensor, always: Iterable[int] = ()) -> torch.Tensor:
+        ids = set(self.frequent)
+        ids.update(always)
+        for src in input_ids.flatten().tolist():
+            # Source ids are kept too so names and numbers can be copied.
+            ids.add(src)
+            ids.update(self.table.get(src, ()))
+        return torch.tensor(sorted(ids), dtype=torch.long)
+
+
+def build_shortlist(
+    model_id: str,
+    pairs: Iterable[Tuple[Sequence[int], Sequence[int]]],
+    top_k: int = 50,
+    frequent_size: int = 500,
+    revision: Optional[str] = None,
+) -> Shortlist:
+    cooccurrence: Dict[int, Counter] = defaultdict(Counter)
+    target_counts: Counter = Counter()
+    for src_ids, tgt_ids in pairs:
+        targets = set(tgt_ids)
+        target_counts.update(tgt_ids)
+        for src in set(src_ids):
+            cooccurrence[src].update(targets)
+
+    frequent = [tgt for tgt, _ in target_counts.most_common(frequent_size)]
+    always = set(frequent)
+    table = {}
+    for src, counts in cooccurrence.items():
+        ranked = [tgt for tgt, _ in counts.most_common() if tgt not in always]
+        if ranked:
+            table[src] = sorted(ranked[:top_k])
+    return Shortlist(model_id, table, sorted(frequent), revision)
+
+
+class ShortlistLMHead(nn.Module):
+    """Output projection that only scores the active shortlist candidates.
+
+    Logits outside the candidate set are ``-inf``, so ``generate`` keeps
+    working on full-vocabulary ids while the matmul covers only the subset.
+    Candidates are set per thread, so concurrent requests on one model do not
+    share them.
+    """
+
+    def __init__(self, base: nn.Linear, shortlist: Shortlist):
+        super().__init__()
+        self.base = base
+        self.shortlist = shortlist
+        self._active = threading.local()
+
+    @property
+    def weight(self) -> torch.Tensor:
+        return self.base.weight
+
+    @contextmanager
+    def restrict(self, candidates: torch.Tensor) -> Iterator[None]:
+        candidates = candidates.to(self.base.weight.device)
+        bias = self.base.bias
+        previous = getattr(self._active, "value", None)
+        self._active.value = (
+            candidates,
+            self.base.weight.index_select(0, candidates),
+            bias.index_select(0, candidates) if bias is not None else None,
+        )
+        try:
+            yield
+        finally:
+            self._active.value = previous
+
+    def forward(self, hidden: torch.Tensor) -> torch.Tensor:
+        active: Optional[Tuple[torch.Tensor, torch.Tensor, Optional[torch.Tensor]]] = getattr(
+            self._active, "value", None
+        )
+        if active is None:
+            return F.linear(hidden, self.base.weight, self.base.bias)
+        candidates, weight, bias = active
+        logits = hidden.new_full(
+            (*hidden.shape[:-1], self.base.out_features), float("-inf")
+        )
+        logits[..., candidates] = F.linear(hidden, weight, bias)
+        return logits
+
+
+def install_shortlist(model: Any, shortlist: Shortlist) -> None:
+    head = model.get_output_embeddings()
+    if isinstance(head, ShortlistLMHead):
+        head = head.base
+    model.set_output_embeddings(ShortlistLMHead(head, shortlist))
+
+
+@contextmanager
+def shortlist_decoding(
+    model: Any, input_ids: torch.Tensor, always: Iterable[int] = ()
+) -> Iterator[None]:
+    head = model.get_output_embeddings()
+    if not isinstance(head, ShortlistLMHead):
+        yield
+        return
+    with head.restrict(head.shortlist.candidates(input_ids, always)):
+        yield
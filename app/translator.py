@@ -1,17 +1,44 @@
-from typing import Optional, Any, Dict, Tuple
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from typing import Optional, Any, Callable, Deque, Dict, Iterator, List, Tuple, TypeVar
 
+import logging
 import os
+import random
+import statistics
 import threading
+import time
 
 import torch
 from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
 
+from app.shortlist import Shortlist, install_shortlist, shortlist_decoding
+
 SUPPORTED_MODELS: Dict[Tuple[str, str], str] = {
     ("en", "fr"): "Helsinki-NLP/opus-mt-en-fr",
     ("en", "es"): "Helsinki-NLP/opus-mt-en-es",
 }
 MAX_INPUT_TOKENS = int(os.getenv("MAX_INPUT_TOKENS", "512"))
 MAX_NEW_TOKENS = int(os.getenv("MAX_NEW_TOKENS", "256"))
+# Directory of "<src>-<tgt>.json" tables from scripts.build_shortlist.
+SHORTLIST_DIR = os.getenv("SHORTLIST_DIR")
+ROLLOUT_WARMUP_TEXT = os.getenv("ROLLOUT_WARMUP_TEXT", "Hello, how are you today?")
+LATENCY_WINDOW = 1000
+# Multi-target requests fan out over MULTI_TARGET_LANES threads. Both knobs
+# below are opt-in: INFERENCE_LANES also caps concurrent decodes per worker on
+# every entry point, and INFERENCE_THREADS is a torch thread budget split
+# evenly across those lanes. Unset, decoding is uncapped with torch defaults.
+INFERENCE_LANES = os.getenv("INFERENCE_LANES")
+INFERENCE_THREADS = os.getenv("INFERENCE_THREADS")
+MULTI_TARGET_LANES = max(1, int(INFERENCE_LANES or "2"))
+_inference_slots: Optional[threading.BoundedSemaphore] = (
+    threading.BoundedSemaphore(MULTI_TARGET_LANES) if INFERENCE_LANES else None
+)
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
 
 
 class UnsupportedLanguagePairError(ValueError):
@@ -22,12 +49,92 @@ class ModelUnavailableError(RuntimeError):
     pass
 
 
+class RolloutConflictError(RuntimeError):
+    pass
+
+
+class LoadedModel:
+    """A loaded tokenizer/model pair with its in-flight count and latencies."""
+
+    def __init__(self, model_id: str, revision: Optional[str], tokenizer: Any, model: Any):
+        self.model_id = model_id
+        self.revision = revision
+        self.tokenizer = tokenizer
+        self.model = model
+        self._in_flight = 0
+        self._idle = threading.Condition()
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def acquire(self) -> None:
+        with self._idle:
+            self._in_flight += 1
+
+    def release(self) -> None:
+        with self._idle:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._idle.notify_all()
+
+    def generate(self, text: str) -> str:
+        with _inference_slots or nullcontext():
+            start = time.perf_counter()
+            translation = self._decode(text)
+            self._latencies.append(time.perf_counter() - start)
+        return translation
+
+    def warm_up(self, text: str) -> None:
+        # Not recorded: a cold first call would skew the latency comparison.
+        with _inference_slots or nullcontext():
+            self._decode(text)
+
+    def _decode(self, text: str) -> str:
+        tokenizer, model = self.tokenizer, self.model
+        with torch.no_grad():
+            inputs = tokenizer(
+                text,
+                return_tensors="pt",
+                truncation=True,
+                max_length=MAX_INPUT_TOKENS,
+                )
+            with shortlist_decoding(model, inputs["input_ids"], tokenizer.all_special_ids):
+                outputs = model.generate(**inputs, max_new_tokens=MAX_NEW_TOKENS)
+        translation: str = tokenizer.decode(outputs[0], skip_special_tokens=True)
+        return translation
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        with self._idle:
+            return self._idle.wait_for(lambda: self._in_flight == 0, timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+        stats: Dict[str, Any] = {
+            "model_id": self.model_id,
+            "revision": self.revision,
+            "in_flight": self._in_flight,
+            "requests": len(latencies),
+        }
+        if latencies:
+            stats["p50_ms"] = round(statistics.median(latencies) * 1000, 1)
+            stats["p95_ms"] = round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 1)
+        return stats
+
+
 class TranslatorService:
     def __init__(self, model_map: Dict[Tuple[str, str], str]):
-        self._model_map = model_map
-        self._cache: Dict[Tuple[str, str], Tuple[Any, Any]] = {}
+        self._model_map = dict(model_map)
+        self._revisions: Dict[Tuple[str, str], Optional[str]] = {}
+        self._cache: Dict[Tuple[str, str], LoadedModel] = {}
+        # pair -> (model, traffic percent, status of the rollout that made it)
+        self._canaries: Dict[Tuple[str, str], Tuple[LoadedModel, float, Dict[str, Any]]] = {}
+        self._rollouts: Dict[Tuple[str, str], Dict[str, Any]] = {}
         self._lock = threading.Lock()
+        # Guards which model serves a pair; held only briefly, unlike _lock.
+        self._swap_lock = threading.Lock()
+        self._reserved = threading.local()
         self._last_error: Optional[Exception] = None
+        self._lanes = ThreadPoolExecutor(
+            max_workers=MULTI_TARGET_LANES, thread_name_prefix="inference-lane"
+        )
 
     def normalize_lang(self, lang: str) -> str:
         return lang.strip().lower()
@@ -40,13 +147,50 @@ class TranslatorService:
         return tuple(sorted(self._model_map.keys()))
 
     def _load_pair(self, pair: Tuple[str, str]) -> None:
-        model_id = self._model_map[pair]
-        tokenizer = AutoTokenizer.from_pretrained(model_id)
-        model = AutoModelForSeq2SeqLM.from_pretrained(model_id)
+        self._cache[pair] = self._load_model(
+            pair, self._model_map[pair], self._revisions.get(pair)
+        )
+
+    def _load_model(
+        self, pair: Tuple[str, str], model_id: str, revision: Optional[str]
+    ) -> LoadedModel:
+        tokenizer = AutoTokenizer.from_pretrained(model_id, revision=revision)
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_id, revision=revision)
         model.eval()
-        self._cache[pair] = (tokenizer, model)
+        shortlist = self._find_shortlist(pair, model_id, revision)
+        if shortlist is not None:
+            install_shortlist(model, shortlist)
+        return LoadedModel(model_id, revision, tokenizer, model)
+
+    def _find_shortlist(
+        self, pair: Tuple[str, str], model_id: str, revision: Optional[str] = None
+    ) -> Optional[Shortlist]:
+        if not SHORTLIST_DIR:
+            return None
+        path = os.path.join(SHORTLIST_DIR, f"{pair[0]}-{pair[1]}.json")
+        if not os.path.exists(path):
+            return None
+        try:
+            shortlist = Shortlist.load(path)
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.warning("Ignoring unreadable shortlist %s: %s", path, exc)
+            return None
+        if (shortlist.model_id, shortlist.revision) != (model_id, revision):
+            logger.warning(
+                "Ignoring shortlist %s built for %s@%s, not %s@%s",
+                path,
+                shortlist.model_id,
+                shortlist.revision,
+                model_id,
+                revision,
+            )
+            return None
+        return shortlist
 
     def load_all(self) -> None:
+        if INFERENCE_THREADS:
+            lanes = MULTI_TARGET_LANES if INFERENCE_LANES else 1
+            torch.set_num_threads(max(1, int(INFERENCE_THREADS) // lanes))
         with self._lock:
             for pair in self._model_map.keys():
                 if pair in self._cache:
@@ -61,11 +205,7 @@ class TranslatorService:
             self._last_error = None
 
     def translate(self, text: str, source_lang: str, target_lang: str) -> Tuple[str, str]:
-        pair = (self.normalize_lang(source_lang), self.normalize_lang(target_lang))
-        if pair not in self._model_map:
-            raise UnsupportedLanguagePairError(
-                f"Supported language pairs: {self.supported_pairs_str()}"
-            )
+        pair = self._require_pair(source_lang, target_lang)
 
         if pair not in self._cache:
             with self._lock:
@@ -79,17 +219,170 @@ class TranslatorService:
                             "Translation model is unavailable. Download the model and try again."
                         ) from exc
 
-        tokenizer, model = self._cache[pair]
-        with torch.no_grad():
-            inputs = tokenizer(
-                text,
-                return_tensors="pt",
-                truncation=True,
-                max_length=MAX_INPUT_TOKENS,
+        with self.reserve(*pair) as loaded:
+            if loaded is None:
+                raise ModelUnavailableError("Translation model is unavailable.")
+            translation = loaded.generate(text)
+        return translation, loaded.model_id
+
+    @contextmanager
+    def reserve(self, source_lang: str, target_lang: str) -> Iterator[Optional[LoadedModel]]:
+        """Pins the model (stable or canary) serving this thread's pair.
+
+        The model is chosen and its in-flight count raised under the swap
+        lock, so a rollout cannot see it idle while this request is about to
+        use it. Translations inside the block, including nested reservations,
+        use the same model. Yields None when the pair is not loaded yet.
+        """
+        pair = (self.normalize_lang(source_lang), self.normalize_lang(target_lang))
+        outer = getattr(self._reserved, "value", None)
+        if outer is not None and outer[0] == pair:
+            yield outer[1]
+            return
+        with self._swap_lock:
+            loaded = self._cache.get(pair)
+            canary = self._canaries.get(pair)
+            if loaded is not None and canary is not None:
+                if random.uniform(0, 100) < canary[1]:
+                    loaded = canary[0]
+            if loaded is not None:
+                loaded.acquire()
+        if loaded is None:
+            yield None
+            return
+        self._reserved.value = (pair, loaded)
+        try:
+            yield loaded
+        finally:
+            self._reserved.value = outer
+            loaded.release()
+
+    def submit_to_lane(self, fn: Callable[..., T], *args: Any) -> "Future[T]":
+        return self._lanes.submit(fn, *args)
+
+    def start_rollout(
+        self,
+        source_lang: str,
+        target_lang: str,
+        model_id: str,
+        revision: Optional[str] = None,
+        canary_percent: float = 0.0,
+    ) -> Dict[str, Any]:
+        """Load, warm and swap in a new model for a pair in the background.
+
+        With ``canary_percent`` set, the new model only takes that share of
+        traffic until it is promoted or rolled back.
+        """
+        pair = self._require_pair(source_lang, target_lang)
+        with self._lock:
+            current = self._rollouts.get(pair)
+            if current is not None and current["state"] in ("loading", "draining"):
+                raise RolloutConflictError(
+                    f"A rollout for {pair[0]}->{pair[1]} is already in progress"
+                )
+            if pair in self._canaries:
+                raise RolloutConflictError(
+                    f"Promote or roll back the canary for {pair[0]}->{pair[1]} first"
                 )
-            outputs = model.generate(**inputs, max_new_tokens=MAX_NEW_TOKENS)
-        translation = tokenizer.decode(outputs[0], skip_special_tokens=True)
-        return translation, self._model_map[pair]
+            status: Dict[str, Any] = {
+                "source_lang": pair[0],
+                "target_lang": pair[1],
+                "model_id": model_id,
+                "revision": revision,
+                "canary_percent": canary_percent,
+                "state": "loading",
+                "error": None,
+            }
+            self._rollouts[pair] = status
+        threading.Thread(
+            target=self._run_rollout, args=(pair, status), daemon=True
+        ).start()
+        return dict(status)
+
+    def _run_rollout(self, pair: Tuple[str, str], status: Dict[str, Any]) -> None:
+        try:
+            loaded = self._load_model(pair, status["model_id"], status["revision"])
+            loaded.warm_up(ROLLOUT_WARMUP_TEXT)
+        except Exception as exc:
+            logger.exception("Rollout of %s failed", status["model_id"])
+            status.update(state="failed", error=str(exc))
+            return
+        if status["canary_percent"] > 0:
+            with self._swap_lock:
+                self._canaries[pair] = (loaded, status["canary_percent"], status)
+            status["state"] = "canary"
+            return
+        self._swap_in(pair, loaded, status)
+
+    def _swap_in(
+        self, pair: Tuple[str, str], loaded: LoadedModel, status: Dict[str, Any]
+    ) -> None:
+        with self._swap_lock:
+            previous = self._cache.get(pair)
+            # Promotion retires the canary entry; a full rollout cannot start while one is live.
+            canary = self._canaries.pop(pair, None)
+            self._cache[pair] = loaded
+            self._model_map[pair] = loaded.model_id
+            self._revisions[pair] = loaded.revision
+            status["state"] = "draining"
+        for retired in (previous, canary[0] if canary else None):
+            if retired is not None and retired is not loaded:
+                retired.wait_idle()
+        status["state"] = "active"
+
+    def promote_canary(self, source_lang: str, target_lang: str) -> Dict[str, Any]:
+        pair = self._require_pair(source_lang, target_lang)
+        with self._lock, self._swap_lock:
+            canary = self._canaries.get(pair)
+            if canary is None:
+                raise RolloutConflictError(f"No canary for {pair[0]}->{pair[1]}")
+            status = canary[2]
+            status["state"] = "draining"
+        threading.Thread(
+            target=self._swap_in, args=(pair, canary[0], status), daemon=True
+        ).start()
+        return dict(status)
+
+    def rollback_canary(self, source_lang: str, target_lang: str) -> Dict[str, Any]:
+        pair = self._require_pair(source_lang, target_lang)
+        with self._lock, self._swap_lock:
+            canary = self._canaries.pop(pair, None)
+            if canary is None:
+                raise RolloutConflictError(f"No canary for {pair[0]}->{pair[1]}")
+            status = canary[2]
+            status["state"] = "rolled_back"
+        return dict(status)
+
+    def model_status(self) -> List[Dict[str, Any]]:
+        result = []
+        for pair in self.supported_pairs():
+            entry: Dict[str, Any] = {
+                "source_lang": pair[0],
+                "target_lang": pair[1],
+                "model_id": self._model_map[pair],
+                "active": None,
+                "canary": None,
+                "rollout": None,
+            }
+            loaded = self._cache.get(pair)
+            if loaded is not None:
+                entry["active"] = loaded.stats()
+            canary = self._canaries.get(pair)
+            if canary is not None:
+                entry["canary"] = {**canary[0].stats(), "percent": canary[1]}
+            rollout = self._rollouts.get(pair)
+            if rollout is not None:
+                entry["rollout"] = dict(rollout)
+            result.append(entry)
+        return result
+
+    def _require_pair(self, source_lang: str, target_lang: str) -> Tuple[str, str]:
+        pair = (self.normalize_lang(source_lang), self.normalize_lang(target_lang))
+        if pair not in self._model_map:
+            raise UnsupportedLanguagePairError(
+                f"Supported language pairs: {self.supported_pairs_str()}"
+            )
+        return pair
 
     def is_available(self) -> bool:
         return self._last_error is None
@@ -0,0 +1,181 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Any, Dict, Optional, Set
+
+from fastapi import HTTPException, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from app.handlers import translate_payload
+from app.metrics import (
+    translator_errors_total,
+    translator_request_latency_seconds,
+    translator_requests_total,
+)
+from app.schemas import TranslationMessage
+
+WS_ENDPOINT = "/ws/translate"
+WS_MAX_IN_FLIGHT = int(os.getenv("WS_MAX_IN_FLIGHT", "4"))
+
+logger = logging.getLogger(__name__)
+
+
+class TranslateSocketSession:
+    """Serves pipelined translate messages over a single WebSocket.
+
+    Each message carries an ``id`` that is echoed back with its result, so
+    results are sent as soon as they finish rather than in arrival order.
+    Messages sharing a ``key`` supersede one another: when a newer message
+    arrives, the older one is answered with ``"cancelled"`` instead of its
+    translation.
+    """
+
+    def __init__(self, websocket: WebSocket, max_in_flight: int = WS_MAX_IN_FLIGHT):
+        self._websocket = websocket
+        self._connection_id = websocket.headers.get("X-Request-ID") or str(uuid.uuid4())
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._send_lock = asyncio.Lock()
+        self._tasks: Set[asyncio.Task] = set()
+        self._latest: Dict[str, asyncio.Task] = {}
+        self._superseded: Set[asyncio.Task] = set()
+        self._closed = False
+
+    async def run(self) -> None:
+        try:
+            while True:
+                frame = await self._websocket.receive()
+                if frame["type"] == "websocket.disconnect":
+                    break
+                if frame.get("text") is None:
+                    translator_errors_total.labels(
+                        endpoint=WS_ENDPOINT, error_category="bad_request"
+                    ).inc()
+                    await self._send(
+                        {
+                            "id": None,
+                            "status": "error",
+                            "status_code": 400,
+                            "detail": "Messages must be JSON text frames",
+                        }
+                    )
+                    continue
+                await self._dispatch(frame["text"])
+        except WebSocketDisconnect:
+            pass
+        finally:
+            self._closed = True
+            for task in list(self._tasks):
+                task.cancel()
+
+    async def _dispatch(self, raw: str) -> None:
+        try:
+            message = TranslationMessage.model_validate_json(raw)
+        except ValidationError as exc:
+            translator_errors_total.labels(
+                endpoint=WS_ENDPOINT, error_category="bad_request"
+            ).inc()
+            await self._send(
+                {
+                    "id": _message_id(raw),
+                    "status": "error",
+                    "status_code": 422,
+                    "detail": json.loads(exc.json(include_url=False)),
+                }
+            )
+            return
+
+        task = asyncio.create_task(self._translate(message))
+        self._tasks.add(task)
+        task.add_done_callback(self._forget)
+        if message.key is not None:
+            previous = self._latest.get(message.key)
+            if previous is not None and not previous.done():
+                self._superseded.add(previous)
+            self._latest[message.key] = task
+
+    def _forget(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        self._superseded.discard(task)
+        for key, latest in list(self._latest.items()):
+            if latest is task:
+                del self._latest[key]
+
+    async def _translate(self, message: TranslationMessage) -> None:
+        task = asyncio.current_task()
+        request_id = message.request_id or f"{self._connection_id}:{message.id}"
+        start = time.perf_counter()
+        result: Dict[str, Any]
+        async with self._slots:
+            # A message superseded while queued never reaches the model. One
+            # superseded mid-inference cannot be interrupted in its worker
+            # thread, so its result is dropped instead.
+            if task in self._superseded:
+                await self._cancelled(message)
+                return
+            try:
+                response = await run_in_threadpool(
+                    translate_payload, message, request_id, WS_ENDPOINT
+                )
+                result = {"id": message.id, "status": "ok", **response.model_dump()}
+                status_code = 200
+            except HTTPException as exc:
+                result = {
+                    "id": message.id,
+                    "status": "error",
+                    "status_code": exc.status_code,
+                    "detail": exc.detail,
+                }
+                status_code = exc.status_code
+            except Exception:
+                logger.exception("WebSocket message %s failed", message.id)
+                translator_errors_total.labels(
+                    endpoint=WS_ENDPOINT, error_category="internal_error"
+                ).inc()
+                result = {
+                    "id": message.id,
+                    "status": "error",
+                    "status_code": 500,
+                    "detail": "Internal server error",
+                }
+                status_code = 500
+
+        if task in self._superseded:
+            await self._cancelled(message)
+            return
+
+        translator_request_latency_seconds.labels(endpoint=WS_ENDPOINT).observe(
+            time.perf_counter() - start
+        )
+        translator_requests_total.labels(
+            endpoint=WS_ENDPOINT, method="WS", status_code=str(status_code)
+        ).inc()
+        await self._send(result)
+
+    async def _cancelled(self, message: TranslationMessage) -> None:
+        # Superseding is normal typing, not a failure, so it is not an error.
+        translator_requests_total.labels(
+            endpoint=WS_ENDPOINT, method="WS", status_code="cancelled"
+        ).inc()
+        await self._send({"id": message.id, "status": "cancelled"})
+
+    async def _send(self, data: Dict[str, Any]) -> None:
+        if self._closed:
+            return
+        async with self._send_lock:
+            try:
+                await self._websocket.send_json(data)
+            except (WebSocketDisconnect, RuntimeError):
+                self._closed = True
+
+
+def _message_id(raw: str) -> Optional[str]:
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return None
+    message_id = data.get("id") if isinstance(data, dict) else None
+    return message_id if isinstance(message_id, str) else None
@@ -0,0 +1,91 @@
+"""Compare shortlist decoding against full-vocabulary decoding.
+
+Each sentence is translated both ways with the same model; the report gives
+per-mode latency, the speedup and how often the outputs agree.
+
+    python -m scripts.benchmark_shortlist --model Helsinki-NLP/opus-mt-en-fr \\
+        --shortlist shortlists/en-fr.json --input sample.en
+"""
+import argparse
+import statistics
+import time
+from typing import List, Tuple
+
+import torch
+from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+from app.shortlist import Shortlist, install_shortlist, shortlist_decoding
+
+
+def read_lines(path: str) -> List[str]:
+    with open(path, encoding="utf-8") as handle:
+        return [line.strip() for line in handle if line.strip()]
+
+
+def token_agreement(full: List[int], short: List[int]) -> float:
+    length = max(len(full), len(short))
+    if length == 0:
+        return 1.0
+    return sum(a == b for a, b in zip(full, short)) / length
+
+
+def timed_generate(model, inputs, max_new_tokens: int) -> Tuple[List[int], float]:
+    start = time.perf_counter()
+    with torch.no_grad():
+        outputs = model.generate(**inputs, max_new_tokens=max_new_tokens)
+    return outputs[0].tolist(), time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", required=True, help="Hugging Face model id")
+    parser.add_argument("--revision", help="model revision")
+    parser.add_argument("--shortlist", required=True, help="table from scripts.build_shortlist")
+    parser.add_argument("--input", required=True, help="source sentences, one per line")
+    parser.add_argument("--max-new-tokens", type=int, default=256)
+    parser.add_argument("--warmup", type=int, default=3)
+    args = parser.parse_args()
+
+    tokenizer = AutoTokenizer.from_pretrained(args.model, revision=args.revision)
+    model = AutoModelForSeq2SeqLM.from_pretrained(args.model, revision=args.revision)
+    model.eval()
+    install_shortlist(model, Shortlist.load(args.shortlist))
+    sentences = read_lines(args.input)
+
+    full_times: List[float] = []
+    short_times: List[float] = []
+    candidate_sizes: List[int] = []
+    agreements: List[float] = []
+    exact = 0
+    for index, sentence in enumerate(sentences):
+        inputs = tokenizer(sentence, return_tensors="pt", truncation=True)
+        full_ids, full_time = timed_generate(model, inputs, args.max_new_tokens)
+        head = model.get_output_embeddings()
+        candidates = head.shortlist.candidates(inputs["input_ids"], tokenizer.all_special_ids)
+        with shortlist_decoding(model, inputs["input_ids"], tokenizer.all_special_ids):
+            short_ids, short_time = timed_generate(model, inputs, args.max_new_tokens)
+        if index < args.warmup:
+            continue
+        full_times.append(full_time)
+        short_times.append(short_time)
+        candidate_sizes.append(len(candidates))
+        agreements.append(token_agreement(full_ids, short_ids))
+        exact += full_ids == short_ids
+
+    if not full_times:
+        parser.error("not enough sentences after warmup")
+    vocab_size = head.base.out_features
+    full_mean = statistics.mean(full_times)
+    short_mean = statistics.mean(short_times)
+    print(f"sentences:          {len(full_times)}")
+    print(f"vocabulary:         {vocab_size}")
+    print(f"mean candidates:    {statistics.mean(candidate_sizes):.0f}")
+    print(f"full decode:        mean {full_mean * 1000:.1f} ms, p50 {statistics.median(full_times) * 1000:.1f} ms")
+    print(f"shortlist decode:   mean {short_mean * 1000:.1f} ms, p50 {statistics.median(short_times) * 1000:.1f} ms")
+    print(f"speedup:            {full_mean / short_mean:.2f}x")
+    print(f"exact agreement:    {exact / len(full_times):.1%}")
+    print(f"token agreement:    {statistics.mean(agreements):.1%}")
+
+
+if __name__ == "__main__":
+    main()
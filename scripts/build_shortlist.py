@@ -0,0 +1,70 @@
+"""Build a lexical shortlist table for one translation model.
+
+The corpus (one source sentence per line) is translated with full-vocabulary
+decoding, and source/output token co-occurrences are counted into a table
+that ``SHORTLIST_DIR`` can serve. Name the output ``<src>-<tgt>.json``.
+
+    python -m scripts.build_shortlist --model Helsinki-NLP/opus-mt-en-fr \\
+        --corpus corpus.en --out shortlists/en-fr.json
+"""
+import argparse
+from typing import Iterator, List, Optional, Tuple
+
+import torch
+from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+from app.shortlist import build_shortlist
+
+
+def read_lines(path: str) -> List[str]:
+    with open(path, encoding="utf-8") as handle:
+        return [line.strip() for line in handle if line.strip()]
+
+
+def aligned_token_ids(
+    model_id: str,
+    revision: Optional[str],
+    sentences: List[str],
+    batch_size: int,
+    max_new_tokens: int,
+) -> Iterator[Tuple[List[int], List[int]]]:
+    tokenizer = AutoTokenizer.from_pretrained(model_id, revision=revision)
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_id, revision=revision)
+    model.eval()
+    special = set(tokenizer.all_special_ids)
+    for start in range(0, len(sentences), batch_size):
+        batch = sentences[start : start + batch_size]
+        with torch.no_grad():
+            inputs = tokenizer(batch, return_tensors="pt", padding=True, truncation=True)
+            outputs = model.generate(**inputs, max_new_tokens=max_new_tokens)
+        for src_ids, tgt_ids in zip(inputs["input_ids"].tolist(), outputs.tolist()):
+            yield (
+                [token for token in src_ids if token not in special],
+                [token for token in tgt_ids if token not in special],
+            )
+        print(f"translated {min(start + batch_size, len(sentences))}/{len(sentences)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", required=True, help="Hugging Face model id")
+    parser.add_argument("--revision", help="model revision; must match the served one")
+    parser.add_argument("--corpus", required=True, help="source sentences, one per line")
+    parser.add_argument("--out", required=True, help="output JSON path")
+    parser.add_argument("--top-k", type=int, default=50, help="targets kept per source token")
+    parser.add_argument("--frequent", type=int, default=500, help="always-allowed target tokens")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--max-new-tokens", type=int, default=256)
+    args = parser.parse_args()
+
+    sentences = read_lines(args.corpus)
+    pairs = aligned_token_ids(
+        args.model, args.revision, sentences, args.batch_size, args.max_new_tokens
+    )
+    shortlist = build_shortlist(args.model, pairs, args.top_k, args.frequent, args.revision)
+    shortlist.save(args.out)
+    print(f"wrote {args.out}: {len(shortlist.table)} source tokens, {len(shortlist.frequent)} frequent")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""Replay production-shaped load against a running translation API.
+
+The load shape comes either from structured ``translate_success`` /
+``translate_failure`` log lines (arrival times, language pairs and text
+lengths) or from a synthetic Poisson profile. Requests are sent open-loop:
+each is fired at its scheduled time whether or not earlier ones finished.
+
+    python -m scripts.load_replay --log api.log --url http://localhost:8000
+    python -m scripts.load_replay --synthetic --rate 5 --duration 60 \\
+        --pairs en-fr=0.7,en-es=0.3 --ramp 1,2,4,8
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import httpx
+
+TRACE_EVENTS = ("translate_success", "translate_failure")
+MAX_TEXT_LENGTH = 1000
+WORDS = (
+    "the quick brown fox jumps over a lazy dog while we read about new "
+    "weather reports and travel plans for next summer in the mountains"
+).split()
+
+
+class Arrival:
+    def __init__(
+        self,
+        offset: float,
+        source_lang: str,
+        target_lang: str,
+        text_length: int,
+        recorded_latency_ms: Optional[int] = None,
+        recorded_status: Optional[int] = None,
+    ):
+        self.offset = offset
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.text_length = text_length
+        self.recorded_latency_ms = recorded_latency_ms
+        self.recorded_status = recorded_status
+
+
+class Result:
+    def __init__(self, latency: float, status_code: Optional[int]):
+        self.latency = latency
+        self.status_code = status_code
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code == 200
+
+
+def parse_log_events(lines: Iterable[str]) -> List[dict]:
+    events = []
+    for line in lines:
+        start = line.find("{")
+        if start < 0:
+            continue
+        try:
+            payload = json.loads(line[start:])
+        except ValueError:
+            continue
+        if payload.get("event") in TRACE_EVENTS and "ts" in payload:
+            events.append(payload)
+    return events
+
+
+def arrivals_from_events(events: Sequence[dict]) -> List[Arrival]:
+    # Events are logged on completion, so the arrival is ts minus latency.
+    starts = [event["ts"] - event.get("latency_ms", 0) / 1000 for event in events]
+    if not starts:
+        return []
+    first = min(starts)
+    arrivals = [
+        Arrival(
+            offset=start - first,
+            source_lang=event["source_lang"],
+            target_lang=event["target_lang"],
+            text_length=max(1, min(MAX_TEXT_LENGTH, event.get("text_length", 1))),
+            recorded_latency_ms=event.get("latency_ms"),
+            recorded_status=event.get("status_code"),
+        )
+        for start, event in zip(starts, events)
+    ]
+    return sorted(arrivals, key=lambda arrival: arrival.offset)
+
+
+def parse_pairs(spec: str) -> Dict[Tuple[str, str], float]:
+    weights = {}
+    for entry in spec.split(","):
+        pair, _, weight = entry.partition("=")
+        src, _, tgt = pair.strip().partition("-")
+        weights[(src, tgt)] = float(weight or 1)
+    return weights
+
+
+def synthetic_arrivals(
+    rate: float,
+    duration: float,
+    pair_weights: Dict[Tuple[str, str], float],
+    mean_length: float,
+    seed: int = 0,
+) -> List[Arrival]:
+    rng = random.Random(seed)
+    pairs = list(pair_weights)
+    weights = [pair_weights[pair] for pair in pairs]
+    # Log-normal lengths with the requested mean and a moderate spread.
+    sigma = 0.8
+    mu = math.log(mean_length) - sigma**2 / 2
+    arrivals = []
+    offset = rng.expovariate(rate)
+    while offset < duration:
+        src, tgt = rng.choices(pairs, weights)[0]
+        length = int(rng.lognormvariate(mu, sigma))
+        arrivals.append(Arrival(offset, src, tgt, max(1, min(MAX_TEXT_LENGTH, length))))
+        offset += rng.expovariate(rate)
+    return arrivals
+
+
+def generate_text(length: int, rng: random.Random) -> str:
+    words: List[str] = []
+    size = 0
+    while size < length:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:length].strip() or "a"
+
+
+async def replay(
+    arrivals: Sequence[Arrival],
+    client: httpx.AsyncClient,
+    speed: float = 1.0,
+    seed: int = 0,
+) -> Tuple[List[Result], float]:
+    rng = random.Random(seed)
+    payloads = [
+        {
+            "text": generate_text(arrival.text_length, rng),
+            "source_lang": arrival.source_lang,
+            "target_lang": arrival.target_lang,
+        }
+        for arrival in arrivals
+    ]
+
+    async def send(payload: dict) -> Result:
+        sent = time.perf_counter()
+        try:
+            response = await client.post("/translate", json=payload)
+            status_code: Optional[int] = response.status_code
+        except httpx.HTTPError:
+            status_code = None
+        return Result(time.perf_counter() - sent, status_code)
+
+    tasks = []
+    start = time.perf_counter()
+    for arrival, payload in zip(arrivals, payloads):
+        delay = start + arrival.offset / speed - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(payload)))
+    results = await asyncio.gather(*tasks)
+    return list(results), time.perf_counter() - start
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+def summarize(
+    results: Sequence[Result], elapsed: float, offered_rate: float
+) -> Dict[str, float]:
+    latencies_ms = [result.latency * 1000 for result in results if result.ok]
+    errors = sum(not result.ok for result in results)
+    return {
+        "requests": len(results),
+        "offered_rps": offered_rate,
+        "throughput_rps": len(latencies_ms) / elapsed if elapsed > 0 else 0.0,
+        "error_rate": errors / len(results) if results else 0.0,
+        "p50_ms": percentile(latencies_ms, 50),
+        "p95_ms": percentile(latencies_ms, 95),
+        "p99_ms": percentile(latencies_ms, 99),
+    }
+
+
+def recorded_summary(arrivals: Sequence[Arrival]) -> Optional[Dict[str, float]]:
+    latencies = [
+        float(arrival.recorded_latency_ms)
+        for arrival in arrivals
+        if arrival.recorded_latency_ms is not None and arrival.recorded_status == 200
+    ]
+    if not latencies:
+        return None
+    return {
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+def is_saturated(
+    step: Dict[str, float], baseline: Dict[str, float], max_error_rate: float
+) -> bool:
+    return (
+        step["throughput_rps"] < 0.9 * step["offered_rps"]
+        or step["error_rate"] > max_error_rate
+        or step["p99_ms"] > 2 * baseline["p99_ms"]
+    )
+
+
+def print_step(label: str, summary: Dict[str, float]) -> None:
+    print(
+        f"{label:>8}  offered {summary['offered_rps']:7.2f} rps  "
+        f"throughput {summary['throughput_rps']:7.2f} rps  "
+        f"errors {summary['error_rate']:6.1%}  "
+        f"p50 {summary['p50_ms']:8.1f} ms  p95 {summary['p95_ms']:8.1f} ms  "
+        f"p99 {summary['p99_ms']:8.1f} ms"
+    )
+
+
+async def run(args: argparse.Namespace, arrivals: List[Arrival]) -> None:
+    duration = max(arrival.offset for arrival in arrivals) or 1.0
+    speeds = [float(speed) for speed in args.ramp.split(",")]
+    limits = httpx.Limits(max_connections=args.max_connections)
+    async with httpx.AsyncClient(
+        base_url=args.url, timeout=args.timeout, limits=limits
+    ) as client:
+        steps = []
+        for speed in speeds:
+            results, elapsed = await replay(arrivals, client, speed, args.seed)
+            summary = summarize(results, elapsed, len(arrivals) * speed / duration)
+            steps.append(summary)
+            print_step(f"x{speed:g}", summary)
+
+    recorded = recorded_summary(arrivals)
+    if recorded is not None:
+        print(
+            f"{'recorded':>8}  p50 {recorded['p50_ms']:8.1f} ms  "
+            f"p95 {recorded['p95_ms']:8.1f} ms  p99 {recorded['p99_ms']:8.1f} ms"
+        )
+    saturated = next(
+        (step for step in steps if is_saturated(step, steps[0], args.max_error_rate)),
+        None,
+    )
+    if saturated is None:
+        print("saturation: not reached")
+    else:
+        print(f"saturation: at ~{saturated['offered_rps']:.2f} rps offered")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--log", help="log file with translate_success/failure events")
+    parser.add_argument("--synthetic", action="store_true", help="use a synthetic profile")
+    parser.add_argument("--rate", type=float, default=5.0, help="synthetic arrivals per second")
+    parser.add_argument("--duration", type=float, default=60.0, help="synthetic seconds")
+    parser.add_argument("--pairs", default="en-fr=1,en-es=1", help="synthetic pair weights")
+    parser.add_argument("--mean-length", type=float, default=80.0, help="synthetic mean chars")
+    parser.add_argument("--ramp", default="1", help="comma-separated replay speed multipliers")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--max-connections", type=int, default=1000)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.log:
+        with open(args.log, encoding="utf-8") as handle:
+            arrivals = arrivals_from_events(parse_log_events(handle))
+    elif args.synthetic:
+        arrivals = synthetic_arrivals(
+            args.rate, args.duration, parse_pairs(args.pairs), args.mean_length, args.seed
+        )
+    else:
+        parser.error("pass --log or --synthetic")
+    if not arrivals:
+        parser.error("no requests to replay")
+    asyncio.run(run(args, arrivals))
+
+
+if __name__ == "__main__":
+    main()
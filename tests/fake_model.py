@@ -0,0 +1,22 @@
+"""Echoing LoadedModel shared by tests that need a model without weights."""
+import threading
+from typing import Optional
+
+from app.translator import ROLLOUT_WARMUP_TEXT, LoadedModel
+
+
+class StubModel(LoadedModel):
+    def __init__(
+        self,
+        model_id: str,
+        revision: Optional[str] = None,
+        gate: Optional[threading.Event] = None,
+    ):
+        super().__init__(model_id, revision, tokenizer=None, model=None)
+        self.gate = gate
+
+    def _decode(self, text: str) -> str:
+        if self.gate is not None and text != ROLLOUT_WARMUP_TEXT:
+            self.gate.wait(timeout=5)
+        served_by = f"{self.model_id}@{self.revision}" if self.revision else self.model_id
+        return f"{served_by}:{text}"
@@ -0,0 +1,57 @@
+"""Stand-in backend node for router tests, run as a separate uvicorn process."""
+import os
+
+from fastapi import FastAPI, HTTPException
+
+from app.schemas import MultiTranslationRequest, TranslationRequest
+
+NODE_NAME = os.getenv("FAKE_NODE_NAME", "node")
+NODE_PAIRS = [
+    tuple(pair.split("-")) for pair in os.getenv("FAKE_NODE_PAIRS", "en-fr").split(",")
+]
+NODE_READY = os.getenv("FAKE_NODE_READY", "1") == "1"
+
+app = FastAPI()
+
+
+@app.get("/health")
+def health() -> dict:
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+def ready() -> dict:
+    if not NODE_READY:
+        raise HTTPException(status_code=500, detail="not ready")
+    return {"status": "ok"}
+
+
+@app.get("/supported-languages")
+def supported_languages() -> dict:
+    return {"pairs": [{"source_lang": src, "target_lang": tgt} for src, tgt in NODE_PAIRS]}
+
+
+@app.post("/translate")
+def translate(payload: TranslationRequest) -> dict:
+    return {
+        "translation": f"{NODE_NAME}:{payload.text}",
+        "model": NODE_NAME,
+        "source_lang": payload.source_lang,
+        "target_lang": payload.target_lang,
+        "latency_ms": 0,
+    }
+
+
+@app.post("/translate/multi")
+def translate_multi(payload: MultiTranslationRequest) -> dict:
+    translations = [
+        {
+            "target_lang": target_lang,
+            "status_code": 200,
+            "latency_ms": 0,
+            "translation": f"{NODE_NAME}:{payload.text}",
+            "model": NODE_NAME,
+        }
+        for target_lang in payload.target_langs
+    ]
+    return {"source_lang": payload.source_lang, "translations": translations, "latency_ms": 0}
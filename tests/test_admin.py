@@ -0,0 +1,50 @@
+from fastapi.testclient import TestClient
+
+import app.main as main
+
+
+client = TestClient(main.app)
+
+
+def test_admin_disabled_without_token(monkeypatch):
+    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+    response = client.get("/admin/models")
+    assert response.status_code == 403
+
+
+def test_admin_rejects_wrong_token(monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    response = client.get("/admin/models", headers={"X-Admin-Token": "wrong"})
+    assert response.status_code == 403
+
+
+def test_admin_starts_rollout(monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    calls = []
+
+    def fake_start_rollout(source_lang, target_lang, model_id, revision=None, canary_percent=0.0):
+        calls.append((source_lang, target_lang, model_id, revision, canary_percent))
+        return {"state": "loading", "model_id": model_id}
+
+    monkeypatch.setattr(main.translator_service, "start_rollout", fake_start_rollout)
+    payload = {
+        "source_lang": "en",
+        "target_lang": "fr",
+        "model_id": "Helsinki-NLP/opus-mt-tc-big-en-fr",
+        "canary_percent": 10,
+    }
+    response = client.post("/admin/models", json=payload, headers={"X-Admin-Token": "secret"})
+
+    assert response.status_code == 202
+    assert response.json()["state"] == "loading"
+    assert calls == [("en", "fr", "Helsinki-NLP/opus-mt-tc-big-en-fr", None, 10.0)]
+
+
+def test_admin_promote_without_canary_conflicts(monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    response = client.post(
+        "/admin/models/promote",
+        json={"source_lang": "en", "target_lang": "fr"},
+        headers={"X-Admin-Token": "secret"},
+    )
+    assert response.status_code == 409
@@ -1,6 +1,9 @@
+import threading
+
 from fastapi.testclient import TestClient
 
 import app.main as main
+from app.translator import UnsupportedLanguagePairError
 
 
 client = TestClient(main.app)
@@ -99,3 +102,48 @@ def test_supported_languages_endpoint():
     pairs = data["pairs"]
     assert {"source_lang": "en", "target_lang": "fr"} in pairs
     assert {"source_lang": "en", "target_lang": "es"} in pairs
+
+
+def test_translate_multi_runs_targets_concurrently(monkeypatch):
+    # Both targets must be inside translate at once for the barrier to pass.
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_translate(text, source_lang, target_lang):
+        barrier.wait()
+        return f"{target_lang}:{text}", f"Helsinki-NLP/opus-mt-en-{target_lang}"
+
+    monkeypatch.setattr(main.translator_service, "translate", fake_translate)
+    payload = {"text": "hello", "source_lang": "en", "target_langs": ["fr", "es"]}
+    response = client.post("/translate/multi", json=payload)
+    assert response.status_code == 200, response.text
+
+    data = response.json()
+    assert data["source_lang"] == "en"
+    assert [item["target_lang"] for item in data["translations"]] == ["fr", "es"]
+    assert data["translations"][0]["translation"] == "fr:hello"
+    assert data["translations"][1]["model"] == "Helsinki-NLP/opus-mt-en-es"
+    assert all(isinstance(item["latency_ms"], int) for item in data["translations"])
+
+
+def test_translate_multi_reports_errors_per_target(monkeypatch):
+    def fake_translate(text, source_lang, target_lang):
+        if target_lang != "fr":
+            raise UnsupportedLanguagePairError("Supported language pairs: en->fr")
+        return "bonjour", "Helsinki-NLP/opus-mt-en-fr"
+
+    monkeypatch.setattr(main.translator_service, "translate", fake_translate)
+    payload = {"text": "hello", "source_lang": "en", "target_langs": ["fr", "en", "de"]}
+    response = client.post("/translate/multi", json=payload)
+    assert response.status_code == 200
+
+    results = {item["target_lang"]: item for item in response.json()["translations"]}
+    assert results["fr"]["status_code"] == 200
+    assert results["en"]["status_code"] == 400
+    assert results["en"]["error"] == "source_lang and target_lang must be different"
+    assert results["de"]["status_code"] == 400
+    assert results["de"]["translation"] is None
+
+
+def test_translate_multi_requires_targets():
+    response = client.post("/translate/multi", json={"text": "hello", "target_langs": []})
+    assert response.status_code == 422
@@ -0,0 +1,74 @@
+import asyncio
+import json
+import random
+
+import httpx
+
+import app.main as main
+from scripts import load_replay
+
+
+def log_line(event, ts, latency_ms, target_lang="fr", status_code=200):
+    payload = {
+        "event": event,
+        "ts": ts,
+        "source_lang": "en",
+        "target_lang": target_lang,
+        "text_length": 12,
+        "latency_ms": latency_ms,
+        "status_code": status_code,
+    }
+    return f"INFO {json.dumps(payload)}"
+
+
+def test_arrivals_from_log_rebuild_start_offsets():
+    lines = [
+        "INFO unrelated line",
+        log_line("translate_start", 99.0, 0),
+        log_line("translate_success", 100.5, 500),
+        log_line("translate_failure", 101.2, 200, target_lang="de", status_code=400),
+    ]
+    arrivals = load_replay.arrivals_from_events(load_replay.parse_log_events(lines))
+
+    assert [round(arrival.offset, 3) for arrival in arrivals] == [0.0, 1.0]
+    assert arrivals[1].target_lang == "de"
+    assert arrivals[0].text_length == 12
+    assert load_replay.recorded_summary(arrivals)["p50_ms"] == 500
+
+
+def test_synthetic_arrivals_follow_profile():
+    arrivals = load_replay.synthetic_arrivals(
+        rate=50, duration=20, pair_weights={("en", "fr"): 3, ("en", "es"): 1}, mean_length=80
+    )
+    share_fr = sum(arrival.target_lang == "fr" for arrival in arrivals) / len(arrivals)
+
+    assert 800 < len(arrivals) < 1200
+    assert 0.7 < share_fr < 0.8
+    assert all(1 <= arrival.text_length <= load_replay.MAX_TEXT_LENGTH for arrival in arrivals)
+    assert len(load_replay.generate_text(37, random.Random(0))) <= 37
+
+
+def test_replay_reports_latency_and_errors(monkeypatch):
+    monkeypatch.setattr(
+        main.translator_service,
+        "translate",
+        lambda text, source_lang, target_lang: ("ok", "Helsinki-NLP/opus-mt-en-fr"),
+    )
+    arrivals = [
+        load_replay.Arrival(0.0, "en", "fr", 20),
+        load_replay.Arrival(0.01, "en", "fr", 20),
+        load_replay.Arrival(0.02, "en", "en", 20),
+    ]
+
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await load_replay.replay(arrivals, client)
+
+    results, elapsed = asyncio.run(run())
+    summary = load_replay.summarize(results, elapsed, offered_rate=150)
+
+    assert summary["requests"] == 3
+    assert abs(summary["error_rate"] - 1 / 3) < 1e-9
+    assert summary["p50_ms"] <= summary["p99_ms"]
+    assert load_replay.is_saturated(summary, summary, max_error_rate=0.01)
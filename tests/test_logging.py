@@ -5,6 +5,7 @@ from fastapi.testclient import TestClient
 
 import app.logging_utils as logging_utils
 import app.main as main
+from tests.fake_model import StubModel
 
 
 @pytest.fixture()
@@ -91,3 +92,19 @@ def test_stable_text_hash_is_deterministic():
     second = logging_utils.stable_text_hash("hello")
     assert first == second
     assert first != "hello"
+
+
+def test_translate_logs_model_that_served_canary(client, monkeypatch):
+    pair = ("en", "fr")
+    monkeypatch.setitem(main.translator_service._cache, pair, StubModel("stable"))
+    monkeypatch.setitem(main.translator_service._canaries, pair, (StubModel("canary"), 100.0, {}))
+    log_calls = []
+    monkeypatch.setattr(
+        logging_utils, "log_translate", lambda event, **kwargs: log_calls.append((event, kwargs))
+    )
+
+    response = client.post("/translate", json={"text": "hello", "target_lang": "fr"})
+
+    assert response.json()["model"] == "canary"
+    logged = {event: kwargs["model_id"] for event, kwargs in log_calls}
+    assert logged == {"translate_start": "canary", "translate_success": "canary"}
@@ -1,6 +1,11 @@
+import os
+import subprocess
+import sys
+
 from fastapi.testclient import TestClient
 
 import app.main as main
+from app import metrics
 
 
 client = TestClient(main.app)
@@ -21,3 +26,46 @@ def test_metrics_exposes_error_metrics():
     response = client.get("/metrics")
     assert response.status_code == 200
     assert "translator_errors_total" in response.text
+
+
+def test_metrics_aggregates_across_worker_processes(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    worker = (
+        "import sys\n"
+        "from app.metrics import translator_errors_total, translator_model_available\n"
+        "translator_errors_total.labels(endpoint='/translate', error_category='bad_request').inc()\n"
+        "translator_model_available.set(int(sys.argv[1]))\n"
+    )
+    for available in ("1", "0"):
+        subprocess.run([sys.executable, "-c", worker, available], env=env, check=True)
+
+    scrape = (
+        "from fastapi.testclient import TestClient\n"
+        "import app.main as main\n"
+        "print(TestClient(main.app).get('/metrics').text)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", scrape], env=env, check=True, capture_output=True, text=True
+    )
+    body = result.stdout
+    assert (
+        'translator_errors_total{endpoint="/translate",error_category="bad_request"} 2.0'
+        in body
+    )
+    assert "translator_model_available 0.0" in body
+
+
+def test_mark_dead_workers_drops_stale_gauge_files(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    crashed_worker = (
+        "from app.metrics import translator_model_available\n"
+        "translator_model_available.set(0)\n"
+    )
+    subprocess.run([sys.executable, "-c", crashed_worker], env=env, check=True)
+    assert list(tmp_path.glob("gauge_livemin_*.db"))
+
+    exporter = metrics.MetricsExporter(str(tmp_path))
+    exporter.mark_dead_workers()
+
+    assert not list(tmp_path.glob("gauge_livemin_*.db"))
+    assert b"translator_model_available 0.0" not in exporter.render()
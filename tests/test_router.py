@@ -0,0 +1,179 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app import router
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+def start_node(name: str, pairs: str, ready: bool = True):
+    port = free_port()
+    env = {
+        **os.environ,
+        "FAKE_NODE_NAME": name,
+        "FAKE_NODE_PAIRS": pairs,
+        "FAKE_NODE_READY": "1" if ready else "0",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "tests.fake_node:app", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 15
+    while time.time() < deadline:
+        try:
+            httpx.get(f"{url}/health", timeout=1)
+            return process, url
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"fake node {name} did not start")
+
+
+@pytest.fixture(scope="module")
+def nodes():
+    started = [
+        start_node("a", "en-fr"),
+        start_node("b", "en-fr,en-es"),
+        start_node("c", "en-de", ready=False),
+    ]
+    yield [url for _, url in started]
+    for process, _ in started:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def test_parse_nodes_static_and_discovered():
+    backends = router.parse_nodes("http://a:8000=en-fr;EN-ES, http://b:8000/")
+    assert backends[0].static
+    assert backends[0].pairs == {("en", "fr"), ("en", "es")}
+    assert not backends[1].static
+    assert backends[1].url == "http://b:8000"
+
+
+def test_pick_prefers_least_in_flight_healthy_backend():
+    backends = router.parse_nodes("http://a=en-fr,http://b=en-fr,http://c=en-fr")
+    for backend in backends:
+        backend.healthy = True
+    backends[0].in_flight = 2
+    backends[1].in_flight = 1
+    backends[2].healthy = False
+    shard_router = router.ShardRouter(backends, httpx.AsyncClient())
+
+    assert shard_router.pick(("en", "fr")).url == "http://b"
+    with pytest.raises(router.NoBackendError):
+        shard_router.pick(("en", "es"))
+
+
+def test_router_forwards_to_shards(nodes, monkeypatch):
+    monkeypatch.setattr(router, "ROUTER_NODES", ",".join(nodes))
+    with TestClient(router.app) as client:
+        pairs = client.get("/supported-languages").json()["pairs"]
+        assert {"source_lang": "en", "target_lang": "es"} in pairs
+        assert {"source_lang": "en", "target_lang": "de"} not in pairs
+        assert client.get("/ready").status_code == 200
+
+        response = client.post(
+            "/translate", json={"text": "hello", "source_lang": "en", "target_lang": "es"}
+        )
+        assert response.status_code == 200, response.text
+        assert response.json()["translation"] == "b:hello"
+
+        served_by = {
+            client.post("/translate", json={"text": "hi", "target_lang": "fr"}).json()["model"]
+            for _ in range(6)
+        }
+        assert served_by == {"a", "b"}
+
+        unhealthy = client.post("/translate", json={"text": "hi", "target_lang": "de"})
+        assert unhealthy.status_code == 503
+
+        unknown = client.post("/translate", json={"text": "hi", "target_lang": "it"})
+        assert unknown.status_code == 400
+
+
+def test_router_fans_out_targets_across_shards(nodes, monkeypatch):
+    monkeypatch.setattr(router, "ROUTER_NODES", ",".join(nodes))
+    with TestClient(router.app) as client:
+        response = client.post(
+            "/translate/multi",
+            json={"text": "hello", "target_langs": ["es", "fr", "de", "it"]},
+        )
+
+    assert response.status_code == 200, response.text
+    results = {item["target_lang"]: item for item in response.json()["translations"]}
+    assert results["es"]["translation"] == "b:hello"
+    # fr shares node b with es, so both go out in one call.
+    assert results["fr"]["translation"] == "b:hello"
+    assert results["de"]["status_code"] == 503
+    assert results["it"]["status_code"] == 400
+
+
+def test_group_targets_sends_one_call_per_backend():
+    backends = router.parse_nodes("http://a=en-fr,http://b=en-fr;en-es,http://c=en-de")
+    for backend in backends:
+        backend.healthy = True
+    backends[2].healthy = False
+    shard_router = router.ShardRouter(backends, httpx.AsyncClient())
+
+    groups, unrouted = shard_router.group_targets("en", ["fr", "es", "de"])
+    assert [(backend.url, targets) for backend, targets in groups] == [
+        ("http://b", ["fr", "es"])
+    ]
+    assert list(unrouted) == ["de"]
+
+    groups, _ = shard_router.group_targets("en", ["fr", "es"], exclude={"http://b"})
+    assert [(backend.url, targets) for backend, targets in groups] == [("http://a", ["fr"])]
+
+
+def test_router_skips_node_that_went_down(nodes, monkeypatch):
+    dead = f"http://127.0.0.1:{free_port()}=en-fr"
+    monkeypatch.setattr(router, "ROUTER_NODES", f"{dead},{nodes[0]}")
+    with TestClient(router.app) as client:
+        shard_router = client.app.state.shard_router
+        # Pretend the dead node passed its last health check.
+        shard_router.backends()[0].healthy = True
+        for _ in range(2):
+            response = client.post("/translate", json={"text": "hi", "target_lang": "fr"})
+            assert response.status_code == 200
+            assert response.json()["model"] == "a"
+        assert not shard_router.backends()[0].healthy
+
+
+def test_unknown_pair_is_unavailable_until_all_nodes_report(nodes, monkeypatch):
+    unreachable = f"http://127.0.0.1:{free_port()}"
+    monkeypatch.setattr(router, "ROUTER_NODES", f"{nodes[0]},{unreachable}")
+    with TestClient(router.app) as client:
+        response = client.post("/translate", json={"text": "hi", "target_lang": "it"})
+        assert response.status_code == 503
+
+        client.app.state.shard_router.backends()[1].pairs_known = True
+        response = client.post("/translate", json={"text": "hi", "target_lang": "it"})
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Supported language pairs: en->fr"
+
+
+def test_pick_keeps_session_on_same_backend():
+    backends = router.parse_nodes("http://a=en-fr,http://b=en-fr,http://c=en-fr")
+    for backend in backends:
+        backend.healthy = True
+    shard_router = router.ShardRouter(backends, httpx.AsyncClient())
+
+    chosen = {shard_router.pick(("en", "fr"), affinity="doc-1").url for _ in range(5)}
+    assert len(chosen) == 1
+    backends[[b.url for b in backends].index(chosen.pop())].healthy = False
+    assert shard_router.pick(("en", "fr"), affinity="doc-1").healthy
@@ -0,0 +1,78 @@
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app import sessions
+from tests.fake_model import StubModel
+
+
+client = TestClient(main.app)
+
+
+def test_split_segments_keeps_separators():
+    parts = sessions.split_segments("Hello there. How are you?\nFine!")
+    assert parts[0::2] == ["Hello there.", "How are you?", "Fine!"]
+    assert "".join(parts) == "Hello there. How are you?\nFine!"
+
+
+def test_incremental_translate_reuses_unchanged_segments(monkeypatch):
+    translated = []
+
+    def fake_translate(text, source_lang, target_lang):
+        translated.append(text)
+        return text.upper(), "Helsinki-NLP/opus-mt-en-fr"
+
+    monkeypatch.setattr(main.translator_service, "translate", fake_translate)
+    monkeypatch.setattr(sessions, "session_store", sessions.SessionStore(10, 60))
+    payload = {"text": "One. Two.", "target_lang": "fr", "session_id": "doc-1"}
+
+    first = client.post("/translate", json=payload).json()
+    payload["text"] = "One. Two changed.\nThree."
+    second = client.post("/translate", json=payload).json()
+
+    assert first["segments_total"] == 2
+    assert first["segments_reused"] == 0
+    assert second["translation"] == "ONE. TWO CHANGED.\nTHREE."
+    assert second["segments_total"] == 3
+    assert second["segments_reused"] == 1
+    assert translated == ["One.", "Two.", "Two changed.", "Three."]
+
+
+def test_translate_without_session_reports_no_segments(monkeypatch):
+    monkeypatch.setattr(
+        main.translator_service,
+        "translate",
+        lambda text, source_lang, target_lang: ("bonjour", "Helsinki-NLP/opus-mt-en-fr"),
+    )
+    data = client.post("/translate", json={"text": "hello", "target_lang": "fr"}).json()
+    assert data["segments_total"] is None
+
+
+def test_session_store_evicts_and_expires(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(sessions.time, "monotonic", lambda: now[0])
+    store = sessions.SessionStore(max_sessions=2, ttl_seconds=10)
+
+    store.put(("a", "en", "fr", "m", ""), {"x": "X"})
+    store.put(("b", "en", "fr", "m", ""), {"y": "Y"})
+    store.put(("c", "en", "fr", "m", ""), {"z": "Z"})
+    assert store.get(("a", "en", "fr", "m", "")) == {}
+    assert len(store) == 2
+
+    now[0] = 11.0
+    assert store.get(("c", "en", "fr", "m", "")) == {}
+    assert len(store) == 0
+
+
+def test_incremental_translate_does_not_reuse_other_revision(monkeypatch):
+    pair = ("en", "fr")
+    monkeypatch.setattr(sessions, "session_store", sessions.SessionStore(10, 60))
+    payload = {"text": "One. Two.", "target_lang": "fr", "session_id": "doc-1"}
+
+    monkeypatch.setitem(main.translator_service._cache, pair, StubModel("m", "v1"))
+    first = client.post("/translate", json=payload).json()
+    monkeypatch.setitem(main.translator_service._cache, pair, StubModel("m", "v2"))
+    second = client.post("/translate", json=payload).json()
+
+    assert first["translation"] == "m@v1:One. m@v1:Two."
+    assert second["translation"] == "m@v2:One. m@v2:Two."
+    assert second["segments_reused"] == 0
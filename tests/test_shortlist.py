@@ -0,0 +1,86 @@
+import torch
+from transformers import MarianConfig, MarianMTModel
+
+from app import shortlist as shortlist_module
+from app.shortlist import Shortlist, build_shortlist, install_shortlist, shortlist_decoding
+
+
+def tiny_model() -> MarianMTModel:
+    torch.manual_seed(0)
+    config = MarianConfig(
+        vocab_size=64,
+        d_model=16,
+        encoder_layers=1,
+        decoder_layers=1,
+        encoder_attention_heads=2,
+        decoder_attention_heads=2,
+        encoder_ffn_dim=32,
+        decoder_ffn_dim=32,
+        max_position_embeddings=32,
+        pad_token_id=0,
+        eos_token_id=1,
+        decoder_start_token_id=0,
+    )
+    model = MarianMTModel(config)
+    model.eval()
+    return model
+
+
+def test_build_shortlist_ranks_cooccurring_targets():
+    pairs = [([10, 11], [20, 30]), ([10], [20, 31]), ([11], [30, 32])]
+    result = build_shortlist("m", pairs, top_k=1, frequent_size=0)
+    assert result.table == {10: [20], 11: [30]}
+
+    result = build_shortlist("m", pairs, top_k=5, frequent_size=1)
+    assert result.frequent == [20]
+    assert 20 not in result.table[10]
+
+
+def test_shortlist_save_and_load_roundtrip(tmp_path):
+    original = Shortlist("m", {5: [6, 7]}, [1, 2], revision="abc123")
+    path = tmp_path / "en-fr.json"
+    original.save(str(path))
+    loaded = Shortlist.load(str(path))
+    assert loaded.model_id == "m"
+    assert loaded.revision == "abc123"
+    assert loaded.table == {5: [6, 7]}
+    assert loaded.frequent == [1, 2]
+    candidates = loaded.candidates(torch.tensor([[5, 9]]), always=[0])
+    assert candidates.tolist() == [0, 1, 2, 5, 6, 7, 9]
+
+
+def test_shortlist_decoding_with_full_vocabulary_matches_base():
+    model = tiny_model()
+    input_ids = torch.tensor([[5, 6, 7, 1]])
+    expected = model.generate(input_ids=input_ids, max_new_tokens=8, num_beams=2)
+
+    install_shortlist(model, Shortlist("m", {}, list(range(64))))
+    with shortlist_decoding(model, input_ids):
+        outputs = model.generate(input_ids=input_ids, max_new_tokens=8, num_beams=2)
+
+    assert torch.equal(outputs, expected)
+
+
+def test_shortlist_decoding_only_emits_candidates():
+    model = tiny_model()
+    input_ids = torch.tensor([[5, 6, 1]])
+    install_shortlist(model, Shortlist("m", {5: [40, 41]}, [0, 1, 42]))
+    with shortlist_decoding(model, input_ids):
+        outputs = model.generate(input_ids=input_ids, max_new_tokens=8)
+
+    assert set(outputs[0].tolist()) <= {0, 1, 5, 6, 40, 41, 42}
+    assert isinstance(model.get_output_embeddings(), shortlist_module.ShortlistLMHead)
+
+
+def test_shortlist_head_keeps_bias_of_base_projection():
+    torch.manual_seed(0)
+    base = torch.nn.Linear(4, 6)
+    head = shortlist_module.ShortlistLMHead(base, Shortlist("m", {}, []))
+    hidden = torch.randn(2, 4)
+    candidates = torch.tensor([1, 3, 4])
+
+    with head.restrict(candidates):
+        logits = head(hidden)
+
+    assert torch.allclose(logits[:, candidates], base(hidden)[:, candidates])
+    assert torch.isinf(logits[:, [0, 2, 5]]).all()
@@ -1,6 +1,11 @@
+import threading
+import time
+
 import pytest
 
 from app import translator
+from app.shortlist import Shortlist
+from tests.fake_model import StubModel
 
 
 def test_translate_text_unsupported_language_pair():
@@ -17,3 +22,189 @@ def test_translate_text_model_unavailable(monkeypatch):
 
     with pytest.raises(translator.ModelUnavailableError):
         translator.translator_service.translate("hello", "en", "fr")
+
+
+def test_find_shortlist_skips_table_for_other_model(monkeypatch, tmp_path):
+    Shortlist("Helsinki-NLP/opus-mt-en-fr", {}, [1]).save(str(tmp_path / "en-fr.json"))
+    Shortlist("other-model", {}, [1]).save(str(tmp_path / "en-es.json"))
+    monkeypatch.setattr(translator, "SHORTLIST_DIR", str(tmp_path))
+
+    service = translator.translator_service
+    found = service._find_shortlist(("en", "fr"), "Helsinki-NLP/opus-mt-en-fr")
+    assert found is not None
+    assert service._find_shortlist(("en", "es"), "Helsinki-NLP/opus-mt-en-es") is None
+    assert service._find_shortlist(("en", "fr"), "Helsinki-NLP/opus-mt-en-fr", "v2") is None
+
+
+def test_find_shortlist_skips_corrupt_table(monkeypatch, tmp_path):
+    (tmp_path / "en-fr.json").write_text('{"model_id": "Helsinki-NLP/opus-mt-en-fr", "ta')
+    (tmp_path / "en-es.json").write_text('{"model_id": "Helsinki-NLP/opus-mt-en-es"}')
+    monkeypatch.setattr(translator, "SHORTLIST_DIR", str(tmp_path))
+
+    service = translator.translator_service
+    assert service._find_shortlist(("en", "fr"), "Helsinki-NLP/opus-mt-en-fr") is None
+    assert service._find_shortlist(("en", "es"), "Helsinki-NLP/opus-mt-en-es") is None
+
+
+def wait_for_state(service, state, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        rollout = next(m["rollout"] for m in service.model_status() if m["target_lang"] == "fr")
+        if rollout and rollout["state"] == state:
+            return
+        time.sleep(0.01)
+    raise AssertionError(f"rollout never reached {state}")
+
+
+def test_rollout_swaps_after_old_model_drains(monkeypatch):
+    service = translator.TranslatorService(translator.SUPPORTED_MODELS)
+    release = threading.Event()
+    old = StubModel("old", gate=release)
+    service._cache[("en", "fr")] = old
+    monkeypatch.setattr(service, "_load_model", lambda pair, model_id, revision: StubModel(model_id))
+
+    in_flight = threading.Thread(target=service.translate, args=("slow", "en", "fr"))
+    in_flight.start()
+    while old.stats()["in_flight"] == 0:
+        time.sleep(0.01)
+    service.start_rollout("en", "fr", "new")
+    wait_for_state(service, "draining")
+
+    assert service.translate("hello", "en", "fr") == ("new:hello", "new")
+    assert service.model_id_for_pair("en", "fr") == "new"
+    release.set()
+    in_flight.join()
+    wait_for_state(service, "active")
+    assert translator.SUPPORTED_MODELS[("en", "fr")] == "Helsinki-NLP/opus-mt-en-fr"
+
+
+def test_canary_rollout_then_promote(monkeypatch):
+    service = translator.TranslatorService(translator.SUPPORTED_MODELS)
+    service._cache[("en", "fr")] = StubModel("old")
+    monkeypatch.setattr(service, "_load_model", lambda pair, model_id, revision: StubModel(model_id))
+
+    service.start_rollout("en", "fr", "new", canary_percent=100)
+    wait_for_state(service, "canary")
+    assert service.translate("hi", "en", "fr") == ("new:hi", "new")
+    assert service.model_id_for_pair("en", "fr") == "Helsinki-NLP/opus-mt-en-fr"
+
+    status = next(m for m in service.model_status() if m["target_lang"] == "fr")
+    assert status["canary"]["requests"] == 1
+    assert "p95_ms" in status["canary"]
+
+    service.promote_canary("en", "fr")
+    wait_for_state(service, "active")
+    assert service.model_id_for_pair("en", "fr") == "new"
+    with pytest.raises(translator.RolloutConflictError):
+        service.rollback_canary("en", "fr")
+
+
+def test_failed_rollout_keeps_serving_old_model(monkeypatch):
+    service = translator.TranslatorService(translator.SUPPORTED_MODELS)
+    service._cache[("en", "fr")] = StubModel("old")
+
+    def raise_os_error(*args, **kwargs):
+        raise OSError("model missing")
+
+    monkeypatch.setattr(service, "_load_model", raise_os_error)
+    service.start_rollout("en", "fr", "missing")
+    wait_for_state(service, "failed")
+    assert service.translate("hi", "en", "fr") == ("old:hi", "old")
+
+
+def test_rollout_rejected_while_canary_is_live(monkeypatch):
+    service = translator.TranslatorService(translator.SUPPORTED_MODELS)
+    service._cache[("en", "fr")] = StubModel("old")
+    monkeypatch.setattr(service, "_load_model", lambda pair, model_id, revision: StubModel(model_id))
+
+    service.start_rollout("en", "fr", "canary", canary_percent=100)
+    wait_for_state(service, "canary")
+    with pytest.raises(translator.RolloutConflictError):
+        service.start_rollout("en", "fr", "slow", canary_percent=10)
+    with pytest.raises(translator.RolloutConflictError):
+        service.start_rollout("en", "fr", "full")
+
+    promoted = service.promote_canary("en", "fr")
+    assert promoted["model_id"] == "canary"
+    wait_for_state(service, "active")
+    status = next(m for m in service.model_status() if m["target_lang"] == "fr")
+    assert status["rollout"]["model_id"] == "canary"
+    assert status["canary"] is None
+    assert service.translate("x", "en", "fr") == ("canary:x", "canary")
+
+
+def test_full_rollout_allowed_after_canary_rollback(monkeypatch):
+    service = translator.TranslatorService(translator.SUPPORTED_MODELS)
+    service._cache[("en", "fr")] = StubModel("old")
+    monkeypatch.setattr(service, "_load_model", lambda pair, model_id, revision: StubModel(model_id))
+
+    service.start_rollout("en", "fr", "canary", canary_percent=100)
+    wait_for_state(service, "canary")
+    assert service.rollback_canary("en", "fr")["model_id"] == "canary"
+    service.start_rollout("en", "fr", "full")
+    wait_for_state(service, "active")
+
+    assert service.translate("x", "en", "fr") == ("full:x", "full")
+
+
+def test_reserved_model_blocks_swap_until_released(monkeypatch):
+    service = translator.TranslatorService(translator.SUPPORTED_MODELS)
+    service._cache[("en", "fr")] = StubModel("old")
+    monkeypatch.setattr(service, "_load_model", lambda pair, model_id, revision: StubModel(model_id))
+
+    with service.reserve("en", "fr") as loaded:
+        service.start_rollout("en", "fr", "new")
+        wait_for_state(service, "draining")
+        assert loaded.model_id == "old"
+        assert service.translate("x", "en", "fr") == ("old:x", "old")
+        time.sleep(0.05)
+        rollout = next(m["rollout"] for m in service.model_status() if m["target_lang"] == "fr")
+        assert rollout["state"] == "draining"
+
+    wait_for_state(service, "active")
+    assert service.translate("x", "en", "fr") == ("new:x", "new")
+
+
+def test_inference_lanes_cap_concurrent_decodes(monkeypatch):
+    monkeypatch.setattr(translator, "_inference_slots", threading.BoundedSemaphore(1))
+    active = []
+    peak = []
+
+    class CountingModel(translator.LoadedModel):
+        def _decode(self, text):
+            active.append(text)
+            peak.append(len(active))
+            time.sleep(0.05)
+            active.remove(text)
+            return text
+
+    model = CountingModel("m", None, None, None)
+    threads = [
+        threading.Thread(target=model.generate, args=("a",)),
+        threading.Thread(target=model.warm_up, args=("b",)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == [1, 1]
+
+
+def test_decodes_are_uncapped_without_inference_lanes(monkeypatch):
+    monkeypatch.setattr(translator, "_inference_slots", None)
+    both_running = threading.Barrier(2, timeout=5)
+
+    class BarrierModel(translator.LoadedModel):
+        def _decode(self, text):
+            both_running.wait()
+            return text
+
+    model = BarrierModel("m", None, None, None)
+    threads = [threading.Thread(target=model.generate, args=(text,)) for text in "ab"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not both_running.broken
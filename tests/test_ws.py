@@ -0,0 +1,110 @@
+import threading
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+import app.main as main
+from app import ws
+
+
+client = TestClient(main.app)
+
+
+def test_ws_translate_pipelined_messages(monkeypatch):
+    def fake_translate(text, source_lang, target_lang):
+        return f"{target_lang}:{text}", f"Helsinki-NLP/opus-mt-{source_lang}-{target_lang}"
+
+    monkeypatch.setattr(main.translator_service, "translate", fake_translate)
+
+    with client.websocket_connect("/ws/translate") as websocket:
+        websocket.send_json({"id": "1", "text": "hello", "target_lang": "fr"})
+        websocket.send_json({"id": "2", "text": "hello", "target_lang": "es"})
+        replies = {reply["id"]: reply for reply in (websocket.receive_json(), websocket.receive_json())}
+
+    assert replies["1"]["status"] == "ok"
+    assert replies["1"]["translation"] == "fr:hello"
+    assert replies["1"]["model"] == "Helsinki-NLP/opus-mt-en-fr"
+    assert replies["2"]["translation"] == "es:hello"
+    assert isinstance(replies["2"]["latency_ms"], int)
+
+
+def test_ws_translate_reports_errors_per_message():
+    with client.websocket_connect("/ws/translate") as websocket:
+        websocket.send_json({"id": "1", "text": "hello", "target_lang": "en"})
+        reply = websocket.receive_json()
+        assert reply == {
+            "id": "1",
+            "status": "error",
+            "status_code": 400,
+            "detail": "source_lang and target_lang must be different",
+        }
+
+        websocket.send_json({"id": "2", "text": "", "target_lang": "fr"})
+        reply = websocket.receive_json()
+        assert reply["id"] == "2"
+        assert reply["status_code"] == 422
+
+
+def test_ws_translate_cancels_superseded_message(monkeypatch):
+    release = threading.Event()
+
+    def fake_translate(text, source_lang, target_lang):
+        if text == "hel":
+            release.wait(timeout=5)
+        return text.upper(), "Helsinki-NLP/opus-mt-en-fr"
+
+    monkeypatch.setattr(main.translator_service, "translate", fake_translate)
+    cancelled = {"endpoint": "/ws/translate", "method": "WS", "status_code": "cancelled"}
+    cancelled_before = REGISTRY.get_sample_value("translator_requests_total", cancelled) or 0
+
+    with client.websocket_connect("/ws/translate") as websocket:
+        websocket.send_json({"id": "1", "key": "doc", "text": "hel", "target_lang": "fr"})
+        websocket.send_json({"id": "2", "key": "doc", "text": "hello", "target_lang": "fr"})
+        first = websocket.receive_json()
+        release.set()
+        second = websocket.receive_json()
+
+    assert first["id"] == "2"
+    assert first["translation"] == "HELLO"
+    assert second == {"id": "1", "status": "cancelled"}
+    assert REGISTRY.get_sample_value("translator_requests_total", cancelled) == cancelled_before + 1
+    assert (
+        REGISTRY.get_sample_value(
+            "translator_errors_total", {"endpoint": "/ws/translate", "error_category": "cancelled"}
+        )
+        is None
+    )
+
+
+def test_ws_translate_rejects_binary_frame_and_keeps_session(monkeypatch):
+    monkeypatch.setattr(
+        main.translator_service,
+        "translate",
+        lambda text, source_lang, target_lang: ("bonjour", "Helsinki-NLP/opus-mt-en-fr"),
+    )
+
+    with client.websocket_connect("/ws/translate") as websocket:
+        websocket.send_bytes(b"\x00\x01")
+        reply = websocket.receive_json()
+        assert reply["status_code"] == 400
+
+        websocket.send_json({"id": "1", "text": "hello", "target_lang": "fr"})
+        assert websocket.receive_json()["translation"] == "bonjour"
+
+
+def test_ws_translate_reports_unexpected_errors(monkeypatch):
+    def broken_translate_payload(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(ws, "translate_payload", broken_translate_payload)
+
+    with client.websocket_connect("/ws/translate") as websocket:
+        websocket.send_json({"id": "1", "text": "hello", "target_lang": "fr"})
+        reply = websocket.receive_json()
+
+    assert reply == {
+        "id": "1",
+        "status": "error",
+        "status_code": 500,
+        "detail": "Internal server error",
+    }